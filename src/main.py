@@ -549,6 +549,7 @@ VERSION:
 import sys
 import os
 import glob
+import stat
 import time
 
 # SharePoint sync modules
@@ -583,10 +584,9 @@ def discover_files(file_path, recursive, exclude_patterns_list):
         tuple: (list of file paths, list of directory paths)
 
     Process:
-        1. Use glob.glob() to find all items matching the pattern
-        2. Apply exclusion filters to remove unwanted items
-        3. Separate files from directories
-        4. Return both lists
+        1. Stream items matching the pattern with glob.iglob()
+        2. Apply exclusion filters and categorize each item in a single pass
+        3. Return files and directories as separate lists
 
     Examples:
         >>> discover_files('*.pdf', False, [])
@@ -595,40 +595,50 @@ def discover_files(file_path, recursive, exclude_patterns_list):
         >>> discover_files('src/**/*.py', True, ['__pycache__', '*.pyc'])
         (['src/main.py', 'src/utils.py'], [])
     """
-    # Use glob to find all files/directories matching the pattern
-    # glob.glob() returns a list of paths matching a pathname pattern
+    # Stream matches with glob.iglob() instead of materializing the full list
+    # up front. On large trees glob.glob() would briefly hold every matched
+    # path three times (unfiltered list, filtered list, categorized lists);
+    # iterating lazily keeps exactly one copy of each surviving path string.
     # Examples: '*.txt' finds all .txt files, '**/*.py' finds all .py files recursively
-    local_items_unfiltered = glob.glob(file_path, recursive=recursive)
-
-    # Apply exclusion filters if provided
-    if exclude_patterns_list:
-        local_items = [item for item in local_items_unfiltered if not should_exclude_path(item, exclude_patterns_list)]
-        excluded_count = len(local_items_unfiltered) - len(local_items)
-        if excluded_count > 0 and is_debug_enabled():
-            print(f"[=] Excluded {excluded_count} item(s) matching exclusion patterns")
-    else:
-        local_items = local_items_unfiltered
-
-    # Exit with error if no matches found
-    if not local_items:
-        if exclude_patterns_list and local_items_unfiltered:
-            print(f"[Error] All files matched by pattern '{file_path}' were excluded by filters")
-            print(f"[Error] {len(local_items_unfiltered)} file(s) found but all matched exclusion patterns: {', '.join(exclude_patterns_list)}")
-        else:
-            print(f"[Error] No files or directories matched pattern: {file_path}")
-        sys.exit(1)  # Exit code 1 indicates error to calling process (e.g., GitHub Actions)
+    matched_count = 0   # Total items the glob pattern matched
+    excluded_count = 0  # Items removed by exclusion filters
 
-    # Separate files from directories
     local_files = []  # Will contain paths to actual files
     local_dirs = []   # Will contain paths to directories
 
-    # Iterate through each matched item and categorize it
-    for item in local_items:
-        if os.path.isfile(item):  # Check if path points to a file
+    # Filter and categorize each matched item in a single pass
+    for item in glob.iglob(file_path, recursive=recursive):
+        matched_count += 1
+        if exclude_patterns_list and should_exclude_path(item, exclude_patterns_list):
+            excluded_count += 1
+            continue
+        # Single stat call per item: os.path.isfile() followed by
+        # os.path.isdir() would issue two stat syscalls for every match.
+        # A statx(AT_STATX_DONT_SYNC) ctypes binding was considered for
+        # network filesystems, but the action runs in an Alpine (musl)
+        # container against a local runner checkout, where plain os.stat
+        # is already a kernel-cache hit.
+        try:
+            mode = os.stat(item).st_mode
+        except OSError:
+            continue  # Broken symlink or item removed mid-scan
+        if stat.S_ISREG(mode):  # Check if path points to a file
             local_files.append(item)  # Add to files list
-        elif os.path.isdir(item):  # Check if path points to a directory
+        elif stat.S_ISDIR(mode):  # Check if path points to a directory
             local_dirs.append(item)   # Add to directories list
 
+    if excluded_count > 0 and is_debug_enabled():
+        print(f"[=] Excluded {excluded_count} item(s) matching exclusion patterns")
+
+    # Exit with error if no matches survived the exclusion filters
+    if matched_count == excluded_count:
+        if exclude_patterns_list and matched_count > 0:
+            print(f"[Error] All files matched by pattern '{file_path}' were excluded by filters")
+            print(f"[Error] {matched_count} file(s) found but all matched exclusion patterns: {', '.join(exclude_patterns_list)}")
+        else:
+            print(f"[Error] No files or directories matched pattern: {file_path}")
+        sys.exit(1)  # Exit code 1 indicates error to calling process (e.g., GitHub Actions)
+
     return local_files, local_dirs
 
 
@@ -683,13 +693,8 @@ def print_summary(total_files, whatif_mode=False):
         total_files (int): Total number of files processed
         whatif_mode (bool): Whether sync deletion is in WhatIf mode
     """
-    def format_bytes(bytes_val):
-        """Convert bytes to human-readable format"""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if bytes_val < 1024.0:
-                return f"{bytes_val:.1f} {unit}"
-            bytes_val /= 1024.0
-        return f"{bytes_val:.1f} TB"
+    # Shared bit-length-based formatter (duplicated loop version removed)
+    from sharepoint_sync.monitoring import format_bytes
 
     # Create visual separator for better readability
     print()  # Empty print - won't get [Main] prefix in DEBUG mode
@@ -750,6 +755,12 @@ def print_summary(total_files, whatif_mode=False):
         efficiency = (stats['skipped_files'] / total_processed) * 100
         print(f"\n[EFFICIENCY] {efficiency:.1f}% of files were already up-to-date")
 
+    # Surface sanitizer memoization hit rates in debug runs
+    if is_debug_enabled():
+        from sharepoint_sync.file_handler import sanitize_sharepoint_name, sanitize_path_components
+        print(f"[DEBUG] Sanitizer caches: names={sanitize_sharepoint_name.cache_info()}, "
+              f"paths={sanitize_path_components.cache_info()}")
+
     # Display rate limiting statistics
     print_rate_limiting_summary()
 
@@ -918,7 +929,7 @@ def perform_sync_deletion(local_files, base_path, config, sharepoint_cache=None)
         rel_path = rel_path.replace('\\', '/')  # Extra safety for Windows paths
 
         # Handle markdown to HTML conversion
-        if local_file.lower().endswith('.md') and config.convert_md_to_html:
+        if config.convert_md_to_html and os.path.splitext(local_file)[1].lower() == '.md':
             # If converting .md to .html, the SharePoint file will be .html
             rel_path = rel_path[:-3] + '.html'
 
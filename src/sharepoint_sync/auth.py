@@ -5,8 +5,18 @@ Microsoft authentication module for SharePoint sync.
 This module handles Azure AD authentication using MSAL (Microsoft Authentication Library).
 """
 
+import threading
+
 import msal
 
+# Process-wide MSAL application instances, keyed by (authority, client_id).
+# Each ConfidentialClientApplication carries its own in-memory token cache,
+# so reusing the instance lets acquire_token_silent() serve repeat calls
+# without a ~200ms AAD round trip. The lock prevents parallel upload
+# workers from stampeding the token endpoint when the cache is cold.
+_msal_apps = {}
+_msal_lock = threading.Lock()
+
 
 def acquire_token(tenant_id, client_id, client_secret, login_endpoint, graph_endpoint):
     """
@@ -42,18 +52,27 @@ def acquire_token(tenant_id, client_id, client_secret, login_endpoint, graph_end
     # Build the Azure AD authority URL
     # Format: https://login.microsoftonline.com/{tenant_id}
     authority_url = f'https://{login_endpoint}/{tenant_id}'
-
-    # Create MSAL confidential client application
-    # 'Confidential' means it can securely store credentials (unlike public/mobile apps)
-    app = msal.ConfidentialClientApplication(
-        authority=authority_url,           # Azure AD endpoint
-        client_id=client_id,              # Your app registration's ID
-        client_credential=client_secret    # Your app's secret key
-    )
-
-    # Request an access token for Microsoft Graph API
-    # '/.default' scope means "use all permissions granted to this app"
-    token = app.acquire_token_for_client(scopes=[f"https://{graph_endpoint}/.default"])
+    scopes = [f"https://{graph_endpoint}/.default"]
+
+    with _msal_lock:
+        # Reuse the MSAL confidential client application for this authority
+        # ('Confidential' means it can securely store credentials, unlike
+        # public/mobile apps) - its token cache makes repeat calls free
+        app = _msal_apps.get((authority_url, client_id))
+        if app is None:
+            app = msal.ConfidentialClientApplication(
+                authority=authority_url,           # Azure AD endpoint
+                client_id=client_id,              # Your app registration's ID
+                client_credential=client_secret    # Your app's secret key
+            )
+            _msal_apps[(authority_url, client_id)] = app
+
+        # Serve from the token cache when a still-valid token exists;
+        # only hit the AAD token endpoint on a miss or near expiry.
+        # '/.default' scope means "use all permissions granted to this app"
+        token = app.acquire_token_silent(scopes, account=None)
+        if token is None:
+            token = app.acquire_token_for_client(scopes=scopes)
 
     # Check for authentication errors (MSAL returns errors in the token dict, not as exceptions)
     if "access_token" not in token:
@@ -5,8 +5,54 @@ Configuration management for SharePoint sync.
 This module handles command-line argument parsing and configuration setup.
 """
 
+import os
 import sys
 
+# Accepted truthy spellings for boolean arguments (hashed O(1) lookup,
+# built once instead of a fresh list per comparison)
+_TRUTHY = frozenset(('true', '1', 'yes'))
+
+
+def _arg(position, default=""):
+    """
+    Return the positional argument at `position`, or `default` when the
+    argument is absent or passed as an empty string.
+
+    The GitHub Action always fills all 20 positional slots, passing ""
+    for inputs the workflow didn't set - so "absent" and "empty" must both
+    mean "use the default". (This is also why argparse is a poor fit here:
+    its defaults only apply to omitted arguments, not empty ones.)
+
+    Args:
+        position (int): Index into sys.argv
+        default (str): Value to use when the slot is missing or empty
+
+    Returns:
+        str: The argument value or the default
+    """
+    if len(sys.argv) > position and sys.argv[position]:
+        return sys.argv[position]
+    return default
+
+
+def _flag(position, default=False):
+    """
+    Parse the positional argument at `position` as a boolean flag.
+
+    Accepts 'true'/'1'/'yes' (case-insensitive) as True; anything else is
+    False. Missing or empty slots return `default`.
+
+    Args:
+        position (int): Index into sys.argv
+        default (bool): Value to use when the slot is missing or empty
+
+    Returns:
+        bool: The parsed flag
+    """
+    if len(sys.argv) > position and sys.argv[position]:
+        return sys.argv[position].lower() in _TRUTHY
+    return default
+
 
 class Config:
     """Configuration for SharePoint sync operations"""
@@ -47,38 +93,34 @@ class Config:
         self.file_path = sys.argv[7]
 
         # Optional arguments with defaults
-        self.max_retry = int(sys.argv[8]) if len(sys.argv) > 8 and sys.argv[8] else 3
-        self.login_endpoint = sys.argv[9] if len(sys.argv) > 9 and sys.argv[9] else "login.microsoftonline.com"
-        self.graph_endpoint = sys.argv[10] if len(sys.argv) > 10 and sys.argv[10] else "graph.microsoft.com"
-        self.recursive = (sys.argv[11] if len(sys.argv) > 11 else "false").lower() == "true"
-        self.force_upload = (sys.argv[12] if len(sys.argv) > 12 else "false").lower() == "true"
-        self.convert_md_to_html = (sys.argv[13] if len(sys.argv) > 13 else "true").lower() == "true"
-        self.force_md_to_html_regeneration = (sys.argv[14] if len(sys.argv) > 14 else "false").lower() == "true"
-        self.exclude_patterns = sys.argv[15] if len(sys.argv) > 15 and sys.argv[15] else ""
-        self.sync_delete = (sys.argv[16] if len(sys.argv) > 16 else "false").lower() == "true"
-        self.sync_delete_whatif = (sys.argv[17] if len(sys.argv) > 17 else "true").lower() == "true"
+        self.max_retry = int(_arg(8, "3"))
+        self.login_endpoint = _arg(9, "login.microsoftonline.com")
+        self.graph_endpoint = _arg(10, "graph.microsoft.com")
+        self.recursive = _flag(11)
+        self.force_upload = _flag(12)
+        self.convert_md_to_html = _flag(13, default=True)
+        self.force_md_to_html_regeneration = _flag(14)
+        self.exclude_patterns = _arg(15)
+        self.sync_delete = _flag(16)
+        self.sync_delete_whatif = _flag(17, default=True)
 
         # Parallel processing configuration (auto-detect optimal values)
-        import os as os_module
-        cpu_count = os_module.cpu_count() or 4
+        cpu_count = os.cpu_count() or 4
 
         # Max upload workers: Default 4 (Graph API concurrent request limit)
         # Can be overridden but should not exceed 10 to respect API limits
         # WARNING: Starting September 30, 2025, Microsoft will reduce per-app/per-user
         # throttling limits to HALF the total per-tenant limit. Monitor for increased
         # 429 responses after this date. Default of 4 workers should remain safe.
-        if len(sys.argv) > 18 and sys.argv[18]:
-            self.max_upload_workers = min(int(sys.argv[18]), 10)
-        else:
-            self.max_upload_workers = 4  # Safe default for Graph API
+        self.max_upload_workers = min(int(_arg(18, "4")), 10)
 
         # Max markdown workers: Default 4 (mermaid-cli subprocess limit)
         # Balance between parallelism and Chromium memory usage
         self.max_markdown_workers = min(4, cpu_count)
 
         # Debug flags
-        self.debug = (sys.argv[19] if len(sys.argv) > 19 else "false").lower() == "true"
-        self.debug_metadata = (sys.argv[20] if len(sys.argv) > 20 else "false").lower() == "true"
+        self.debug = _flag(19)
+        self.debug_metadata = _flag(20)
 
         # Derived values
         self.tenant_url = f'https://{self.sharepoint_host_name}/sites/{self.site_name}'
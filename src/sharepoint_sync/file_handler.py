@@ -6,15 +6,124 @@ This module provides functions for file sanitization, hashing, comparison, and e
 """
 
 import os
+import mmap
+import atexit
+import sqlite3
+import threading
+import functools
 import xxhash
 import fnmatch
-from .utils import is_debug_enabled
+from .utils import is_debug_enabled, is_debug_metadata_enabled
+
+# Sanitization tables, hoisted to module level so they are built once
+# instead of per sanitize_sharepoint_name() call.
+# Map of illegal characters to safe replacements, using Unicode fullwidth
+# characters that are visually similar but allowed by SharePoint.
+_CHAR_REPLACEMENTS = {
+    '#': '＃',    # Fullwidth number sign
+    '%': '％',    # Fullwidth percent sign
+    '&': '＆',    # Fullwidth ampersand
+    '*': '＊',    # Fullwidth asterisk
+    ':': '：',    # Fullwidth colon
+    '<': '＜',    # Fullwidth less-than
+    '>': '＞',    # Fullwidth greater-than
+    '?': '？',    # Fullwidth question mark
+    '/': '／',    # Fullwidth solidus
+    '\\': '＼',   # Fullwidth reverse solidus
+    '|': '｜',    # Fullwidth vertical line
+    '"': '＂',    # Fullwidth quotation mark
+    '{': '｛',    # Fullwidth left curly bracket
+    '}': '｝',    # Fullwidth right curly bracket
+    '~': '～',    # Fullwidth tilde
+}
+
+# Translation table form of the same mapping: str.translate() replaces all
+# illegal characters in a single C-level pass instead of one .replace() scan
+# per character.
+_SANITIZE_TABLE = str.maketrans(_CHAR_REPLACEMENTS)
+
+# Membership set of the illegal characters, for the clean-name fast path
+_ILLEGAL_CHARS = frozenset(_CHAR_REPLACEMENTS)
+
+# Reserved names (Windows legacy) that SharePoint rejects
+_RESERVED_NAMES = frozenset([
+    'CON', 'PRN', 'AUX', 'NUL',
+    'COM1', 'COM2', 'COM3', 'COM4', 'COM5', 'COM6', 'COM7', 'COM8', 'COM9',
+    'LPT1', 'LPT2', 'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'
+])
+
+# Persistent hash cache (SQLite) shared across runs
+# Keyed by absolute path and validated with (st_mtime_ns, st_size), so a
+# second run on an unchanged checkout pays one stat per file instead of
+# re-reading and re-hashing everything. Lazily opened on first use; any
+# failure disables the cache and hashing proceeds uncached.
+_hash_cache_lock = threading.Lock()
+_hash_cache_conn = None
+_hash_cache_disabled = False
+_hash_cache_pending = 0
+_HASH_CACHE_COMMIT_EVERY = 100  # Batch inserts between commits
+
+
+def _get_hash_cache():
+    """
+    Open (once) and return the persistent hash cache connection.
+
+    Returns:
+        sqlite3.Connection: The cache connection, or None if unavailable
+    """
+    global _hash_cache_conn, _hash_cache_disabled
+
+    if _hash_cache_disabled:
+        return None
+    if _hash_cache_conn is not None:
+        return _hash_cache_conn
+
+    try:
+        cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'spupload')
+        os.makedirs(cache_dir, exist_ok=True)
+        conn = sqlite3.connect(
+            os.path.join(cache_dir, 'hashes.sqlite'),
+            check_same_thread=False  # Guarded by _hash_cache_lock
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS h("
+            "path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, hash TEXT)"
+        )
+        conn.commit()
+        atexit.register(_flush_hash_cache)
+        _hash_cache_conn = conn
+        return conn
+    except Exception as cache_error:
+        if is_debug_enabled():
+            print(f"[!] Hash cache unavailable (hashing uncached): {str(cache_error)[:200]}")
+        _hash_cache_disabled = True
+        return None
+
+
+def _flush_hash_cache():
+    """Commit any batched hash cache inserts (registered via atexit)."""
+    global _hash_cache_pending
+    with _hash_cache_lock:
+        if _hash_cache_conn is not None and _hash_cache_pending:
+            try:
+                _hash_cache_conn.commit()
+                _hash_cache_pending = 0
+            except Exception:
+                pass  # Cache is best-effort; next run simply re-hashes
 
 
+@functools.lru_cache(maxsize=65536)
 def sanitize_sharepoint_name(name, is_folder=False):
     r"""
     Sanitize file/folder names to be compatible with SharePoint/OneDrive.
 
+    Results are memoized (lru_cache): the same names recur for every file of
+    a folder across folder creation, comparison and upload, so repeat calls
+    become a dict hit. A side effect is that the debug log for a changed
+    name prints once per unique name rather than once per call.
+
     SharePoint/OneDrive has strict naming rules:
     - Cannot contain: # % & * : < > ? / \ | " { } ~
     - Cannot start with: ~ $
@@ -32,50 +141,27 @@ def sanitize_sharepoint_name(name, is_folder=False):
     if not name:
         return name
 
-    # Map of illegal characters to safe replacements
-    # Using Unicode similar characters that are visually similar but allowed
-    char_replacements = {
-        '#': '＃',    # Fullwidth number sign
-        '%': '％',    # Fullwidth percent sign
-        '&': '＆',    # Fullwidth ampersand
-        '*': '＊',    # Fullwidth asterisk
-        ':': '：',    # Fullwidth colon
-        '<': '＜',    # Fullwidth less-than
-        '>': '＞',    # Fullwidth greater-than
-        '?': '？',    # Fullwidth question mark
-        '/': '／',    # Fullwidth solidus
-        '\\': '＼',   # Fullwidth reverse solidus
-        '|': '｜',    # Fullwidth vertical line
-        '"': '＂',    # Fullwidth quotation mark
-        '{': '｛',    # Fullwidth left curly bracket
-        '}': '｝',    # Fullwidth right curly bracket
-        '~': '～',    # Fullwidth tilde
-    }
-
-    # Start with original name
-    sanitized = name
-
-    # Replace illegal characters
-    for char, replacement in char_replacements.items():
-        sanitized = sanitized.replace(char, replacement)
-
-    # Remove leading ~ or $ characters
-    while sanitized and sanitized[0] in ['~', '$', '～']:
-        sanitized = sanitized[1:]
+    # Fast path: most real-world names contain no illegal characters and
+    # need no edge fixes, so a single C-level membership scan plus the
+    # cheap boundary checks lets them return untouched
+    if (len(name) <= 255 and name[0] not in '~$～' and name[-1] not in '. '
+            and not any(c in _ILLEGAL_CHARS for c in name)):
+        name_without_ext = name.split('.')[0] if not is_folder else name
+        if name_without_ext.upper() not in _RESERVED_NAMES:
+            return name
+
+    # Replace illegal characters in one pass (table hoisted to module level)
+    sanitized = name.translate(_SANITIZE_TABLE)
+
+    # Remove leading ~ or $ characters (single C-level strip)
+    sanitized = sanitized.lstrip('~$～')
 
     # Remove trailing periods and spaces
     sanitized = sanitized.rstrip('. ')
 
-    # Check for reserved names (Windows legacy)
-    reserved_names = [
-        'CON', 'PRN', 'AUX', 'NUL',
-        'COM1', 'COM2', 'COM3', 'COM4', 'COM5', 'COM6', 'COM7', 'COM8', 'COM9',
-        'LPT1', 'LPT2', 'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'
-    ]
-
-    # Check if name (without extension) is reserved
+    # Check if name (without extension) is reserved (Windows legacy)
     name_without_ext = sanitized.split('.')[0] if not is_folder else sanitized
-    if name_without_ext.upper() in reserved_names:
+    if name_without_ext.upper() in _RESERVED_NAMES:
         sanitized = f"_{sanitized}"  # Prefix with underscore to make it safe
 
     # Ensure name isn't empty after sanitization
@@ -100,10 +186,15 @@ def sanitize_sharepoint_name(name, is_folder=False):
 
     return sanitized
 
+@functools.lru_cache(maxsize=65536)
 def sanitize_path_components(path):
     """
     Sanitize all components of a file path for SharePoint compatibility.
 
+    Memoized: the same parent-directory prefixes recur for every file in a
+    tree, so repeat calls skip the split/sanitize/join entirely (component
+    sanitization underneath is cached as well).
+
     Args:
         path (str): Full path with possibly multiple directory levels
 
@@ -152,7 +243,7 @@ def get_optimal_chunk_size(file_size):
         return 8 * 1024 * 1024  # 8MB chunks - optimal for very large files
 
 
-def calculate_file_hash(file_path):
+def calculate_file_hash(file_path, file_size=None):
     """
     Calculate xxHash128 for a file using dynamic chunk sizing.
 
@@ -162,6 +253,8 @@ def calculate_file_hash(file_path):
 
     Args:
         file_path (str): Path to the file to hash
+        file_size (int, optional): Size of the file when the caller already
+            stat'ed it (e.g. get_file_hash); avoids a second stat syscall
 
     Returns:
         str: Hexadecimal string representation of the xxHash128 (32 characters)
@@ -171,15 +264,31 @@ def calculate_file_hash(file_path):
         regardless of when/where it's calculated (no timestamps involved).
     """
     try:
-        file_size = os.path.getsize(file_path)
+        if file_size is None:
+            file_size = os.path.getsize(file_path)
         chunk_size = get_optimal_chunk_size(file_size)
 
         # Use xxh128 (alias for xxh3_128) for maximum speed on modern CPUs
         hasher = xxhash.xxh128()
 
         with open(file_path, 'rb') as f:
-            while chunk := f.read(chunk_size):
-                hasher.update(chunk)
+            if file_size == 0:
+                return hasher.hexdigest()
+
+            try:
+                # Memory-map the file and feed zero-copy memoryview slices to
+                # the hasher: data flows straight from the page cache without
+                # the per-chunk buffer allocation of f.read()
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    with memoryview(mapped) as view:
+                        for offset in range(0, file_size, chunk_size):
+                            hasher.update(view[offset:offset + chunk_size])
+            except (ValueError, OSError):
+                # mmap can fail on special files or exotic filesystems -
+                # fall back to the buffered read loop
+                f.seek(0)
+                while chunk := f.read(chunk_size):
+                    hasher.update(chunk)
 
         return hasher.hexdigest()
 
@@ -285,6 +394,67 @@ def calculate_file_hash(file_path):
         return None
 
 
+def cached_file_hash(file_path):
+    """
+    Calculate a file's xxHash128, consulting the persistent hash cache first.
+
+    The cache entry is keyed by absolute path and only honored when the
+    file's (st_mtime_ns, st_size) still match what was recorded, so any
+    modification invalidates it automatically. Cache misses fall through to
+    calculate_file_hash() and the fresh hash is written back (committed in
+    batches; final flush happens at interpreter exit).
+
+    Args:
+        file_path (str): Path to the file to hash
+
+    Returns:
+        str: Hexadecimal xxHash128 string, or None if the file is unreadable
+    """
+    global _hash_cache_pending
+
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        # Let calculate_file_hash produce its detailed error reporting
+        return calculate_file_hash(file_path)
+
+    conn = _get_hash_cache()
+    if conn is None:
+        return calculate_file_hash(file_path)
+
+    abs_path = os.path.abspath(file_path)
+
+    try:
+        with _hash_cache_lock:
+            row = conn.execute(
+                "SELECT mtime, size, hash FROM h WHERE path = ?", (abs_path,)
+            ).fetchone()
+        if row and row[0] == st.st_mtime_ns and row[1] == st.st_size:
+            if is_debug_enabled():
+                print(f"[#] Hash cache hit: {row[2][:8]}... for {os.path.basename(file_path)}")
+            return row[2]
+    except Exception:
+        return calculate_file_hash(file_path)
+
+    file_hash = calculate_file_hash(file_path, file_size=st.st_size)
+
+    if file_hash:
+        try:
+            with _hash_cache_lock:
+                conn.execute(
+                    "INSERT OR REPLACE INTO h(path, mtime, size, hash) VALUES (?, ?, ?, ?)",
+                    (abs_path, st.st_mtime_ns, st.st_size, file_hash)
+                )
+                _hash_cache_pending += 1
+                if _hash_cache_pending >= _HASH_CACHE_COMMIT_EVERY:
+                    conn.commit()
+                    _hash_cache_pending = 0
+        except Exception:
+            pass  # Cache write failures are non-fatal
+
+    return file_hash
+
+
 def should_exclude_path(path, exclude_patterns):
     """
     Check if a file or directory path should be excluded based on exclusion patterns.
@@ -360,7 +530,8 @@ def should_exclude_path(path, exclude_patterns):
 def check_file_needs_update(local_path, file_name, site_url, list_name, filehash_column_available,
                             tenant_id=None, client_id=None, client_secret=None, login_endpoint=None,
                             graph_endpoint=None, upload_stats_dict=None, pre_calculated_hash=None, display_path=None,
-                            site_id=None, drive_id=None, parent_item_id=None, sharepoint_cache=None):
+                            site_id=None, drive_id=None, parent_item_id=None, sharepoint_cache=None,
+                            local_size=None):
     """
     Check if a file in SharePoint needs to be updated by comparing hash or size.
 
@@ -396,6 +567,8 @@ def check_file_needs_update(local_path, file_name, site_url, list_name, filehash
         sharepoint_cache (dict, optional): Pre-built cache of SharePoint file metadata
                                           Format: {"path/to/file.html": {"file_hash": "...", "size": 123, ...}}
                                           If None, falls back to individual API queries
+        local_size (int, optional): Local file size if the caller already stat'ed
+                                    the file; avoids a second getsize() syscall
 
     Returns:
         tuple: (needs_update: bool, exists: bool, remote_file: None, local_hash: str or None)
@@ -423,23 +596,44 @@ def check_file_needs_update(local_path, file_name, site_url, list_name, filehash
     # Sanitize the file name to match what would be stored in SharePoint
     sanitized_name = sanitize_sharepoint_name(file_name, is_folder=False)
 
-    # Use pre-calculated hash if provided, otherwise calculate from file
-    local_hash = None
-    if pre_calculated_hash:
-        local_hash = pre_calculated_hash
-        if is_debug_enabled():
-            print(f"[#] Using pre-calculated hash: {local_hash[:8]}... for {sanitized_name}")
-    else:
-        local_hash = calculate_file_hash(local_path)
-        if local_hash:
-            if is_debug_enabled():
+    # Use pre-calculated hash if provided, otherwise defer hashing until a
+    # comparison or metadata write actually needs it. Hashing up front reads
+    # the whole file even when the remote side only offers a size to compare
+    # against (or the FileHash column is unavailable), which is wasted I/O
+    # on skip-heavy runs.
+    local_hash = pre_calculated_hash
+    if pre_calculated_hash and is_debug_enabled():
+        print(f"[#] Using pre-calculated hash: {local_hash[:8]}... for {sanitized_name}")
+
+    def get_local_hash():
+        """Calculate and memoize the local file hash on first use."""
+        nonlocal local_hash
+        if local_hash is None:
+            local_hash = cached_file_hash(local_path)
+            if local_hash and is_debug_enabled():
                 print(f"[#] Local hash: {local_hash[:8]}... for {sanitized_name}")
+        return local_hash
+
+    # Resolve the stats mutation strategy once instead of re-probing
+    # hasattr(upload_stats_dict, 'increment') at every counter site. Using
+    # the wrapper's atomic increment also avoids the read-modify-write of
+    # `stats[key] += 1`, which spans two lock acquisitions in parallel mode.
+    if upload_stats_dict is None:
+        def bump(key, amount=1):
+            pass
+    elif hasattr(upload_stats_dict, 'increment'):
+        bump = upload_stats_dict.increment
+    else:
+        def bump(key, amount=1):
+            upload_stats_dict[key] = upload_stats_dict.get(key, 0) + amount
 
-    # Get local file information
-    local_size = os.path.getsize(local_path)
+    # Get local file information (callers that already stat'ed the file pass
+    # the size through so it isn't fetched twice)
+    if local_size is None:
+        local_size = os.path.getsize(local_path)
 
     # Get debug flag (used throughout function)
-    debug_metadata = os.environ.get('DEBUG_METADATA', 'false').lower() == 'true'
+    debug_metadata = is_debug_metadata_enabled()
 
     # Debug: Show what we're checking
     if is_debug_enabled():
@@ -455,11 +649,7 @@ def check_file_needs_update(local_path, file_name, site_url, list_name, filehash
 
         if cached_file:
             # Cache hit! Use cached metadata instead of API call
-            if upload_stats_dict:
-                if hasattr(upload_stats_dict, 'increment'):
-                    upload_stats_dict.increment('cache_hits')
-                else:
-                    upload_stats_dict['cache_hits'] = upload_stats_dict.get('cache_hits', 0) + 1
+            bump('cache_hits')
 
             if is_debug_enabled():
                 print(f"[CACHE HIT] Found {display_path} in cache")
@@ -469,24 +659,16 @@ def check_file_needs_update(local_path, file_name, site_url, list_name, filehash
             list_item_id = cached_file.get('list_item_id')
 
             # Try hash comparison first if available
-            if filehash_column_available and cached_hash and local_hash:
-                if upload_stats_dict:
-                    if hasattr(upload_stats_dict, 'increment'):
-                        upload_stats_dict.increment('compared_by_hash')
-                    else:
-                        upload_stats_dict['compared_by_hash'] = upload_stats_dict.get('compared_by_hash', 0) + 1
+            if filehash_column_available and cached_hash and get_local_hash():
+                bump('compared_by_hash')
 
                 if cached_hash == local_hash:
                     # Hash match - file unchanged
                     if is_debug_enabled():
                         print(f"[=] File unchanged (cached hash match): {display_path}")
-                    if upload_stats_dict:
-                        upload_stats_dict['skipped_files'] += 1
-                        upload_stats_dict['bytes_skipped'] += local_size
-                        if hasattr(upload_stats_dict, 'increment'):
-                            upload_stats_dict.increment('hash_matched')
-                        else:
-                            upload_stats_dict['hash_matched'] = upload_stats_dict.get('hash_matched', 0) + 1
+                    bump('skipped_files')
+                    bump('bytes_skipped', local_size)
+                    bump('hash_matched')
                     return False, True, None, local_hash
                 else:
                     # Hash mismatch - file changed
@@ -496,22 +678,17 @@ def check_file_needs_update(local_path, file_name, site_url, list_name, filehash
 
             # Fall back to size comparison if hash not available
             elif cached_size is not None:
-                if upload_stats_dict:
-                    if hasattr(upload_stats_dict, 'increment'):
-                        upload_stats_dict.increment('compared_by_size')
-                    else:
-                        upload_stats_dict['compared_by_size'] = upload_stats_dict.get('compared_by_size', 0) + 1
+                bump('compared_by_size')
 
                 if cached_size == local_size:
                     # Size match - likely unchanged
                     if is_debug_enabled():
                         print(f"[=] File unchanged (cached size match): {display_path}")
-                    if upload_stats_dict:
-                        upload_stats_dict['skipped_files'] += 1
-                        upload_stats_dict['bytes_skipped'] += local_size
+                    bump('skipped_files')
+                    bump('bytes_skipped', local_size)
 
                     # Backfill empty FileHash if column exists
-                    if (filehash_column_available and not cached_hash and local_hash and
+                    if (filehash_column_available and not cached_hash and get_local_hash() and
                         list_item_id and site_url and list_name):
                         if is_debug_enabled():
                             print(f"[#] Backfilling empty FileHash for cached file: {display_path}")
@@ -524,38 +701,24 @@ def check_file_needs_update(local_path, file_name, site_url, list_name, filehash
                             if success:
                                 if is_debug_enabled():
                                     print(f"[✓] FileHash backfilled: {local_hash[:8]}...")
-                                if upload_stats_dict:
-                                    if hasattr(upload_stats_dict, 'increment'):
-                                        upload_stats_dict.increment('hash_backfilled')
-                                    else:
-                                        upload_stats_dict['hash_backfilled'] = upload_stats_dict.get('hash_backfilled', 0) + 1
+                                bump('hash_backfilled')
                             else:
-                                if upload_stats_dict:
-                                    if hasattr(upload_stats_dict, 'increment'):
-                                        upload_stats_dict.increment('hash_backfill_failed')
-                                    else:
-                                        upload_stats_dict['hash_backfill_failed'] = upload_stats_dict.get('hash_backfill_failed', 0) + 1
+                                bump('hash_backfill_failed')
                         except Exception:
-                            if upload_stats_dict:
-                                if hasattr(upload_stats_dict, 'increment'):
-                                    upload_stats_dict.increment('hash_backfill_failed')
-                                else:
-                                    upload_stats_dict['hash_backfill_failed'] = upload_stats_dict.get('hash_backfill_failed', 0) + 1
+                            bump('hash_backfill_failed')
 
                     return False, True, None, local_hash
                 else:
                     # Size mismatch - file changed
                     if is_debug_enabled():
                         print(f"[*] File changed (cached size mismatch): {display_path}")
+                    if filehash_column_available:
+                        get_local_hash()  # Needed to set FileHash after the upload
                     return True, True, None, local_hash
         else:
             # Cache miss - file not found in cache
             # Fall through to API query to verify file status (safer than assuming new)
-            if upload_stats_dict:
-                if hasattr(upload_stats_dict, 'increment'):
-                    upload_stats_dict.increment('cache_misses')
-                else:
-                    upload_stats_dict['cache_misses'] = upload_stats_dict.get('cache_misses', 0) + 1
+            bump('cache_misses')
 
             if is_debug_enabled():
                 print(f"[CACHE MISS] {display_path} not found in cache - verifying with API query")
@@ -565,11 +728,7 @@ def check_file_needs_update(local_path, file_name, site_url, list_name, filehash
     # FALLBACK: Individual API query (cache miss or cache not available)
     # ============================================================================
     # Track API query (fallback when cache not available)
-    if upload_stats_dict:
-        if hasattr(upload_stats_dict, 'increment'):
-            upload_stats_dict.increment('api_queries')
-        else:
-            upload_stats_dict['api_queries'] = upload_stats_dict.get('api_queries', 0) + 1
+    bump('api_queries')
 
     # Use Graph REST API to check file existence and get metadata
     # This replaces the Office365 library usage
@@ -588,14 +747,24 @@ def check_file_needs_update(local_path, file_name, site_url, list_name, filehash
                     if is_debug_enabled():
                         print(f"[DEBUG] Querying by path: parent={parent_item_id}, file={sanitized_name}")
 
-                    # Use path-based query to get exact file (fixes duplicate filename bug)
-                    from .graph_api import get_drive_item_by_path_with_list_item
+                    # Share one expanded folder listing across all files being
+                    # checked in this folder (dict lookup per file afterwards)
+                    from .graph_api import get_folder_index, get_drive_item_by_path_with_list_item
 
-                    item_with_list = get_drive_item_by_path_with_list_item(
-                        site_id, drive_id, parent_item_id, sanitized_name,
+                    folder_index = get_folder_index(
+                        site_id, drive_id, parent_item_id,
                         tenant_id, client_id, client_secret, login_endpoint, graph_endpoint
                     )
 
+                    if folder_index is not None:
+                        item_with_list = folder_index.get(sanitized_name)
+                    else:
+                        # Listing failed - fall back to the per-file path query
+                        item_with_list = get_drive_item_by_path_with_list_item(
+                            site_id, drive_id, parent_item_id, sanitized_name,
+                            tenant_id, client_id, client_secret, login_endpoint, graph_endpoint
+                        )
+
                     # Extract listItem fields from the response
                     if item_with_list and 'listItem' in item_with_list:
                         list_item_data = {
@@ -615,6 +784,8 @@ def check_file_needs_update(local_path, file_name, site_url, list_name, filehash
                     # This is safer than using unreliable filename-only search
                     if is_debug_enabled():
                         print(f"[!] Cannot verify file status, assuming needs update: {sanitized_name}")
+                    if filehash_column_available:
+                        get_local_hash()  # Needed to set FileHash after the upload
                     return True, False, None, local_hash
 
                 if list_item_data and 'fields' in list_item_data:
@@ -643,24 +814,14 @@ def check_file_needs_update(local_path, file_name, site_url, list_name, filehash
                                 print(f"[#] Remote hash: {remote_hash[:8]}... for {sanitized_name}")
 
                             # Compare hashes - this is the most reliable comparison
-                            if upload_stats_dict:
-                                # Use atomic increment if available (parallel mode), otherwise use get/set pattern
-                                if hasattr(upload_stats_dict, 'increment'):
-                                    upload_stats_dict.increment('compared_by_hash')
-                                else:
-                                    upload_stats_dict['compared_by_hash'] = upload_stats_dict.get('compared_by_hash', 0) + 1
-
-                            if local_hash and local_hash == remote_hash:
+                            bump('compared_by_hash')
+
+                            if get_local_hash() and local_hash == remote_hash:
                                 if is_debug_enabled():
                                     print(f"[=] File unchanged (hash match): {sanitized_name}")
-                                if upload_stats_dict:
-                                    upload_stats_dict['skipped_files'] += 1
-                                    upload_stats_dict['bytes_skipped'] += local_size
-                                    # Use atomic increment if available (parallel mode), otherwise use get/set pattern
-                                    if hasattr(upload_stats_dict, 'increment'):
-                                        upload_stats_dict.increment('hash_matched')
-                                    else:
-                                        upload_stats_dict['hash_matched'] = upload_stats_dict.get('hash_matched', 0) + 1
+                                bump('skipped_files')
+                                bump('bytes_skipped', local_size)
+                                bump('hash_matched')
                                 return False, True, None, local_hash
                             elif local_hash:
                                 if is_debug_enabled():
@@ -670,20 +831,10 @@ def check_file_needs_update(local_path, file_name, site_url, list_name, filehash
                             # FileHash column exists but value is empty for this file
                             if debug_metadata:
                                 print(f"[DEBUG] FileHash not found in list item fields")
-                            if upload_stats_dict:
-                                # Use atomic increment if available (parallel mode), otherwise use get/set pattern
-                                if hasattr(upload_stats_dict, 'increment'):
-                                    upload_stats_dict.increment('hash_empty_found')
-                                else:
-                                    upload_stats_dict['hash_empty_found'] = upload_stats_dict.get('hash_empty_found', 0) + 1
+                            bump('hash_empty_found')
                     else:
                         # FileHash column doesn't exist at all
-                        if upload_stats_dict:
-                            # Use atomic increment if available (parallel mode), otherwise use get/set pattern
-                            if hasattr(upload_stats_dict, 'increment'):
-                                upload_stats_dict.increment('hash_column_unavailable')
-                            else:
-                                upload_stats_dict['hash_column_unavailable'] = upload_stats_dict.get('hash_column_unavailable', 0) + 1
+                        bump('hash_column_unavailable')
                 elif debug_metadata:
                     print(f"[DEBUG] Could not retrieve list item data for {sanitized_name}")
 
@@ -698,6 +849,8 @@ def check_file_needs_update(local_path, file_name, site_url, list_name, filehash
         if not file_exists:
             if is_debug_enabled():
                 print(f"[+] New file to upload: {sanitized_name}")
+            if filehash_column_available:
+                get_local_hash()  # Needed to set FileHash after the upload
             return True, False, None, local_hash
 
         # If hash comparison wasn't available, fall back to size comparison
@@ -709,15 +862,12 @@ def check_file_needs_update(local_path, file_name, site_url, list_name, filehash
                 # If we still can't get size, assume file needs update
                 if is_debug_enabled():
                     print(f"[!] Cannot determine remote file size for: {sanitized_name}")
+                if filehash_column_available:
+                    get_local_hash()  # Needed to set FileHash after the upload
                 return True, True, None, local_hash
 
             # Compare file sizes only (hash comparison not available)
-            if upload_stats_dict:
-                # Use atomic increment if available (parallel mode), otherwise use get/set pattern
-                if hasattr(upload_stats_dict, 'increment'):
-                    upload_stats_dict.increment('compared_by_size')
-                else:
-                    upload_stats_dict['compared_by_size'] = upload_stats_dict.get('compared_by_size', 0) + 1
+            bump('compared_by_size')
 
             size_matches = (local_size == remote_size)
             needs_update = not size_matches
@@ -725,16 +875,15 @@ def check_file_needs_update(local_path, file_name, site_url, list_name, filehash
             if not needs_update:
                 if is_debug_enabled():
                     print(f"[=] File unchanged (size: {local_size:,} bytes): {sanitized_name}")
-                if upload_stats_dict:
-                    upload_stats_dict['skipped_files'] += 1
-                    upload_stats_dict['bytes_skipped'] += local_size
+                bump('skipped_files')
+                bump('bytes_skipped', local_size)
 
                 # Backfill empty FileHash values
                 # If FileHash column exists but value is empty, and we have confirmed
                 # file is unchanged via size comparison, update the hash without re-uploading
                 if (filehash_column_available and
                     not hash_comparison_available and  # Hash was empty
-                    local_hash and  # We have a calculated hash
+                    get_local_hash() and  # We have a calculated hash
                     site_url and list_name and  # Required for update
                     item_with_list and 'listItem' in item_with_list and 'id' in item_with_list['listItem']):
 
@@ -756,40 +905,29 @@ def check_file_needs_update(local_path, file_name, site_url, list_name, filehash
                         if success:
                             if is_debug_enabled():
                                 print(f"[✓] FileHash backfilled: {local_hash[:8]}...")
-                            if upload_stats_dict:
-                                # Use atomic increment if available (parallel mode), otherwise use get/set pattern
-                                if hasattr(upload_stats_dict, 'increment'):
-                                    upload_stats_dict.increment('hash_backfilled')
-                                else:
-                                    upload_stats_dict['hash_backfilled'] = upload_stats_dict.get('hash_backfilled', 0) + 1
+                            bump('hash_backfilled')
                         else:
                             if is_debug_enabled():
                                 print(f"[!] Failed to backfill FileHash")
-                            if upload_stats_dict:
-                                # Use atomic increment if available (parallel mode), otherwise use get/set pattern
-                                if hasattr(upload_stats_dict, 'increment'):
-                                    upload_stats_dict.increment('hash_backfill_failed')
-                                else:
-                                    upload_stats_dict['hash_backfill_failed'] = upload_stats_dict.get('hash_backfill_failed', 0) + 1
+                            bump('hash_backfill_failed')
 
                     except Exception as backfill_error:
                         if is_debug_enabled():
                             print(f"[!] Error backfilling FileHash: {str(backfill_error)[:200]}")
-                        if upload_stats_dict:
-                            # Use atomic increment if available (parallel mode), otherwise use get/set pattern
-                            if hasattr(upload_stats_dict, 'increment'):
-                                upload_stats_dict.increment('hash_backfill_failed')
-                            else:
-                                upload_stats_dict['hash_backfill_failed'] = upload_stats_dict.get('hash_backfill_failed', 0) + 1
+                        bump('hash_backfill_failed')
 
             else:
                 if is_debug_enabled():
                     display_name = display_path if display_path else sanitized_name
                     print(f"[*] File size changed (local: {local_size:,} vs remote: {remote_size:,}): {display_name}")
+                if filehash_column_available:
+                    get_local_hash()  # Needed to set FileHash after the upload
 
             return needs_update, True, None, local_hash
 
         # Should not reach here, but return safe default
+        if filehash_column_available:
+            get_local_hash()  # Needed to set FileHash after the upload
         return True, file_exists, None, local_hash
 
     except Exception as e:
@@ -805,6 +943,8 @@ def check_file_needs_update(local_path, file_name, site_url, list_name, filehash
             print(f"[DEBUG] Error type: {type(e).__name__}")
             print(f"[DEBUG] Full error: {error_str[:500]}")  # First 500 chars
             print(f"[+] Assuming new file: {sanitized_name}")
+        if filehash_column_available:
+            get_local_hash()  # Needed to set FileHash after the upload
         return True, False, None, local_hash
 
 
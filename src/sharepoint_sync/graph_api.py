@@ -7,6 +7,8 @@ list item operations, and request retry logic.
 """
 
 import time
+import random
+import threading
 import requests
 from dotenv import load_dotenv
 from .auth import acquire_token
@@ -16,12 +18,138 @@ from .utils import is_debug_metadata_enabled, is_debug_enabled
 # Load environment variables
 load_dotenv()
 
+# Shared HTTP session for all Graph API calls.
+# Module-level requests.get/post/etc. open a fresh TCP+TLS connection per
+# call; a Session reuses pooled keep-alive connections, which removes the
+# TLS handshake and connection setup from every per-file hot path call.
+# requests.Session is thread-safe for concurrent requests, so the parallel
+# upload workers can all share this one session.
+_http_session = requests.Session()
+_http_adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=32)
+_http_session.mount('https://', _http_adapter)
+_http_session.mount('http://', _http_adapter)
+
+class _AdaptiveLimiter:
+    """
+    Adaptive concurrency limiter for Graph API requests (AIMD).
+
+    Caps how many requests are in flight at once so the parallel workers
+    can't stampede SharePoint into throttling the whole run. On a 429 the
+    limit halves (multiplicative decrease); after a window of consecutive
+    successes it creeps back up by one (additive increase), converging on
+    whatever concurrency the service currently tolerates.
+    """
+
+    def __init__(self, max_limit=16, min_limit=2, grow_after=50):
+        """
+        Args:
+            max_limit (int): Upper bound on concurrent requests
+            min_limit (int): Floor the limit never shrinks below
+            grow_after (int): Consecutive successes before widening by one
+        """
+        self._condition = threading.Condition()
+        self._max_limit = max_limit
+        self._min_limit = min_limit
+        self._grow_after = grow_after
+        self._limit = max_limit
+        self._in_flight = 0
+        self._successes = 0
+
+    def acquire(self):
+        """Block until a request slot is available, then claim it."""
+        with self._condition:
+            while self._in_flight >= self._limit:
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, throttled=False):
+        """
+        Return a slot and adjust the limit from the request's outcome.
+
+        Args:
+            throttled (bool): True if the request came back 429
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if throttled:
+                new_limit = max(self._min_limit, self._limit // 2)
+                if new_limit < self._limit and is_debug_enabled():
+                    print(f"[⚠] Throttled - reducing Graph concurrency {self._limit} -> {new_limit}")
+                self._limit = new_limit
+                self._successes = 0
+            else:
+                self._successes += 1
+                if self._successes >= self._grow_after and self._limit < self._max_limit:
+                    self._limit += 1
+                    self._successes = 0
+            self._condition.notify_all()
+
+
+# Shared limiter used by make_graph_request_with_retry for every Graph call
+_request_limiter = _AdaptiveLimiter()
+
 # Global cache for column mappings
 column_mapping_cache = {}
 
 # Global cache for site/drive IDs (used by deletion operations)
 site_drive_id_cache = {}
 
+# Global cache for per-folder children indexes, keyed by parent item ID
+# Structure: {parent_item_id: {name: drive_item_with_listItem}}
+# Lets K files in the same folder share one expanded listing instead of
+# issuing K per-file metadata queries.
+folder_index_cache = {}
+
+# Global cache for list name -> list ID indexes, keyed by site ID
+# Built once from a /lists response so per-item calls resolve the target
+# library with a single dict lookup instead of re-scanning every list.
+list_name_index_cache = {}
+
+
+def resolve_list_id(site_id, lists_data, list_name):
+    """
+    Resolve a document library name to its list ID via a cached name index.
+
+    Builds (and caches per site) a dict mapping both the internal name and
+    the display name of every list to its ID, so callers do an O(1) lookup
+    instead of scanning the /lists collection each time. Also centralizes
+    the 'Shared Documents' fallback used when the requested library name
+    doesn't exist on the site.
+
+    Args:
+        site_id (str): SharePoint site ID (cache key)
+        lists_data (dict): Parsed JSON response from the /sites/{id}/lists endpoint
+        list_name (str): Library name to resolve (display or internal name)
+
+    Returns:
+        tuple: (list_id, actual_library_name) - list_id is None if neither
+               the requested name nor 'Shared Documents' was found
+    """
+    name_index = list_name_index_cache.get(site_id)
+    if name_index is None:
+        name_index = {}
+        for sp_list in lists_data.get('value', []):
+            sp_list_id = sp_list.get('id')
+            # setdefault preserves first-match-wins from the old scan loop
+            if sp_list.get('displayName'):
+                name_index.setdefault(sp_list['displayName'], sp_list_id)
+            if sp_list.get('name'):
+                name_index.setdefault(sp_list['name'], sp_list_id)
+        list_name_index_cache[site_id] = name_index
+
+    list_id = name_index.get(list_name)
+    if list_id:
+        return list_id, list_name
+
+    # Fall back to the default document library name
+    fallback_id = name_index.get('Shared Documents')
+    if fallback_id:
+        if is_debug_enabled():
+            print(f"[DEBUG] Using 'Shared Documents' instead of '{list_name}'")
+        return fallback_id, 'Shared Documents'
+
+    return None, list_name
+
 
 def make_graph_request_with_retry(url, headers, method='GET', json_data=None, data=None, params=None, max_retries=3):
     """
@@ -64,25 +192,33 @@ def make_graph_request_with_retry(url, headers, method='GET', json_data=None, da
                     print(f"[⚠] Proactive rate limiting delay: {delay}s")
                 time.sleep(delay)
 
-            # Make the request based on method
-            if method.upper() == 'GET':
-                response = requests.get(url, headers=headers, params=params)
-            elif method.upper() == 'POST':
-                if data is not None:
-                    response = requests.post(url, headers=headers, data=data)
-                else:
-                    response = requests.post(url, headers=headers, json=json_data)
-            elif method.upper() == 'PATCH':
-                response = requests.patch(url, headers=headers, json=json_data)
-            elif method.upper() == 'PUT':
-                if data is not None:
-                    response = requests.put(url, headers=headers, data=data)
+            # Make the request based on method (shared session reuses pooled
+            # connections), holding an adaptive concurrency slot so parallel
+            # workers back off together when SharePoint starts throttling
+            _request_limiter.acquire()
+            throttled = False
+            try:
+                if method.upper() == 'GET':
+                    response = _http_session.get(url, headers=headers, params=params)
+                elif method.upper() == 'POST':
+                    if data is not None:
+                        response = _http_session.post(url, headers=headers, data=data)
+                    else:
+                        response = _http_session.post(url, headers=headers, json=json_data)
+                elif method.upper() == 'PATCH':
+                    response = _http_session.patch(url, headers=headers, json=json_data)
+                elif method.upper() == 'PUT':
+                    if data is not None:
+                        response = _http_session.put(url, headers=headers, data=data)
+                    else:
+                        response = _http_session.put(url, headers=headers, json=json_data)
+                elif method.upper() == 'DELETE':
+                    response = _http_session.delete(url, headers=headers)
                 else:
-                    response = requests.put(url, headers=headers, json=json_data)
-            elif method.upper() == 'DELETE':
-                response = requests.delete(url, headers=headers)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+                    raise ValueError(f"Unsupported HTTP method: {method}")
+                throttled = response.status_code == 429
+            finally:
+                _request_limiter.release(throttled)
 
             # Analyze response headers for rate limiting info (with request type tracking)
             rate_monitor.analyze_response_headers(response, method=method, url=url)
@@ -527,24 +663,9 @@ def check_and_create_filehash_column(site_url, list_name, tenant_id, client_id,
             return False, list_name
 
         lists_data = lists_response.json()
-        list_id = None
-        actual_library_name = list_name
 
-        # Find the document library by name
-        for lst in lists_data.get('value', []):
-            if lst.get('displayName') == list_name or lst.get('name') == list_name:
-                list_id = lst.get('id')
-                break
-
-        if not list_id:
-            # Try "Shared Documents" as fallback
-            for lst in lists_data.get('value', []):
-                if lst.get('displayName') == 'Shared Documents' or lst.get('name') == 'Shared Documents':
-                    list_id = lst.get('id')
-                    actual_library_name = 'Shared Documents'
-                    if is_debug_enabled():
-                        print(f"[DEBUG] Using 'Shared Documents' instead of '{list_name}'")
-                    break
+        # Find the document library by name (indexed lookup with fallback)
+        list_id, actual_library_name = resolve_list_id(site_id, lists_data, list_name)
 
         if not list_id:
             print(f"[!] Document library '{list_name}' not found")
@@ -730,12 +851,8 @@ def update_sharepoint_list_item_field(site_url, list_name, item_id, field_name,
             return False
 
         lists_data = lists_response.json()
-        list_id = None
 
-        for sp_list in lists_data.get('value', []):
-            if sp_list.get('displayName') == list_name or sp_list.get('name') == list_name:
-                list_id = sp_list.get('id')
-                break
+        list_id, list_name = resolve_list_id(site_id, lists_data, list_name)
 
         if not list_id:
             print(f"[!] Could not find list '{list_name}'")
@@ -755,7 +872,7 @@ def update_sharepoint_list_item_field(site_url, list_name, item_id, field_name,
             print(f"[DEBUG] PATCH endpoint: {fields_endpoint}")
             print(f"[DEBUG] Field data to update: {field_data}")
 
-        update_response = requests.patch(fields_endpoint, headers=headers, json=field_data)
+        update_response = _http_session.patch(fields_endpoint, headers=headers, json=field_data)
 
         # Check for rate limiting headers in response
         if debug_metadata:
@@ -1961,6 +2078,80 @@ def get_drive_item_with_list_item(site_id, drive_id, item_id,
         return None
 
 
+def get_folder_index(site_id, drive_id, parent_item_id,
+                     tenant_id, client_id, client_secret, login_endpoint, graph_endpoint):
+    """
+    Get a {name: drive_item} index of a folder's children, with listItem
+    fields expanded, memoized per parent item ID.
+
+    When K files in the same folder each need a metadata check, the per-file
+    path query costs K round-trips; this lists the folder once (following
+    @odata.nextLink pages, so >200-item folders are covered) and answers the
+    remaining K-1 lookups from the cached dict.
+
+    Args:
+        site_id (str): SharePoint site ID
+        drive_id (str): SharePoint drive ID
+        parent_item_id (str): Item ID of the folder to index
+        tenant_id (str): Azure AD tenant ID
+        client_id (str): Azure AD application client ID
+        client_secret (str): Azure AD application client secret
+        login_endpoint (str): Azure AD login endpoint
+        graph_endpoint (str): Microsoft Graph API endpoint
+
+    Returns:
+        dict: Mapping of child name to drive item dict (each with 'listItem'
+              expanded like get_drive_item_by_path_with_list_item() returns)
+        None: If the listing failed (callers should fall back to per-file queries)
+    """
+    cached = folder_index_cache.get(parent_item_id)
+    if cached is not None:
+        return cached
+
+    try:
+        token = acquire_token(tenant_id, client_id, client_secret, login_endpoint, graph_endpoint)
+        if not token:
+            return None
+
+        headers = {
+            'Authorization': f"Bearer {token['access_token']}",
+            'Accept': 'application/json'
+        }
+
+        # Expand listItem fields so hash/size comparisons need no follow-up call
+        expand_clause = "listItem($expand=fields($select=FileHash,FileSizeDisplay,FileLeafRef))"
+        children_url = (f"https://{graph_endpoint}/v1.0/sites/{site_id}/drives/{drive_id}"
+                        f"/items/{parent_item_id}/children?$expand={expand_clause}")
+
+        index = {}
+        while children_url:
+            response = make_graph_request_with_retry(children_url, headers, method='GET')
+
+            if response.status_code != 200:
+                if is_debug_enabled():
+                    print(f"[DEBUG] Folder index listing failed: {response.status_code} - {response.text[:200]}")
+                return None
+
+            data = response.json()
+            for child in data.get('value', []):
+                index[child.get('name')] = child
+
+            # Follow pagination for folders with more items than one page
+            children_url = data.get('@odata.nextLink')
+
+        folder_index_cache[parent_item_id] = index
+
+        if is_debug_enabled():
+            print(f"[DEBUG] Indexed {len(index)} children for folder {parent_item_id}")
+
+        return index
+
+    except Exception as e:
+        if is_debug_enabled():
+            print(f"[DEBUG] Error building folder index: {str(e)[:200]}")
+        return None
+
+
 def upload_small_file_graph(site_id, drive_id, parent_item_id, filename, file_content,
                             tenant_id, client_id, client_secret, login_endpoint, graph_endpoint):
     """
@@ -2107,16 +2298,58 @@ def create_upload_session_graph(site_id, drive_id, parent_item_id, filename,
         return None
 
 
-def upload_file_chunk_graph(upload_url, chunk_data, chunk_start, chunk_end, total_size):
+def _parse_retry_after(retry_after):
+    """
+    Parse a Retry-After header value into seconds.
+
+    The header can be either delta-seconds (e.g. "30") or an HTTP-date
+    (e.g. "Wed, 21 Oct 2025 07:28:00 GMT"). Returns a sensible default
+    when the header is missing or malformed.
+
+    Args:
+        retry_after (str): Raw Retry-After header value (or None)
+
+    Returns:
+        float: Seconds to wait before retrying (capped at 300)
+    """
+    if not retry_after:
+        return 30.0
+
+    try:
+        return min(300.0, float(retry_after))
+    except ValueError:
+        pass
+
+    try:
+        from email.utils import parsedate_to_datetime
+        from datetime import datetime, timezone
+        target = parsedate_to_datetime(retry_after)
+        delta = (target - datetime.now(timezone.utc)).total_seconds()
+        return min(300.0, max(1.0, delta))
+    except Exception:  # noqa: S110 - malformed date, fall back to default
+        return 30.0
+
+
+def upload_file_chunk_graph(upload_url, chunk_data, chunk_start, chunk_end, total_size,
+                            max_retries=3, headers=None):
     """
     Upload a chunk of a file to an upload session using Graph API.
 
+    Transient failures (429 throttling, 5xx server errors, connection
+    drops) are retried with backoff rather than failing the whole
+    resumable upload: 429/503 honor the server's Retry-After header plus
+    a small random jitter, other retryable errors use capped exponential
+    backoff with jitter. Non-transient 4xx errors fail immediately.
+
     Args:
         upload_url (str): Upload URL from create_upload_session_graph()
         chunk_data (bytes): Chunk content as bytes
         chunk_start (int): Starting byte position (0-indexed)
         chunk_end (int): Ending byte position (inclusive)
         total_size (int): Total file size in bytes
+        max_retries (int): Maximum retry attempts for transient errors (default: 3)
+        headers (dict, optional): Precomputed Content-Range/Content-Length
+            headers for this chunk; built from the byte positions if omitted
 
     Returns:
         dict: Upload response:
@@ -2131,40 +2364,75 @@ def upload_file_chunk_graph(upload_url, chunk_data, chunk_start, chunk_end, tota
     """
     debug_enabled = is_debug_enabled()
 
-    try:
-        import requests
-
+    if headers is None:
         headers = {
             'Content-Length': str(len(chunk_data)),
             'Content-Range': f"bytes {chunk_start}-{chunk_end}/{total_size}"
         }
 
-        if debug_enabled:
-            print(f"[DEBUG] Uploading chunk: bytes {chunk_start}-{chunk_end}/{total_size}")
+    if debug_enabled:
+        print(f"[DEBUG] Uploading chunk: bytes {chunk_start}-{chunk_end}/{total_size}")
 
-        # Use requests directly (no retry for chunks per MS documentation)
-        response = requests.put(upload_url, headers=headers, data=chunk_data, timeout=300)
+    for attempt in range(max_retries + 1):
+        try:
+            response = _http_session.put(upload_url, headers=headers, data=chunk_data, timeout=300)
 
-        # Check response
-        if response.status_code in [200, 201, 202]:
-            # 202 = chunk accepted, more chunks expected
-            # 200/201 = upload complete
-            response_data = response.json() if response.content else {}
-            if debug_enabled:
-                if response.status_code == 202:
-                    print(f"[DEBUG] Chunk accepted, continuing...")
-                else:
-                    print(f"[DEBUG] Upload complete!")
-            return response_data
-        else:
+            if response.status_code in [200, 201, 202]:
+                # 202 = chunk accepted, more chunks expected
+                # 200/201 = upload complete
+                response_data = response.json() if response.content else {}
+                if debug_enabled:
+                    if response.status_code == 202:
+                        print(f"[DEBUG] Chunk accepted, continuing...")
+                    else:
+                        print(f"[DEBUG] Upload complete!")
+                return response_data
+
+            if response.status_code in (429, 503):
+                # Throttled - the server tells us how long to back off
+                if attempt < max_retries:
+                    wait_seconds = _parse_retry_after(response.headers.get('Retry-After'))
+                    wait_seconds += random.uniform(0, 0.5)  # Jitter to de-sync parallel workers
+                    if debug_enabled:
+                        print(f"[!] Chunk throttled ({response.status_code}). "
+                              f"Waiting {wait_seconds:.1f}s before retry {attempt + 1}/{max_retries}...")
+                    time.sleep(wait_seconds)
+                    continue
+            elif 500 <= response.status_code < 600:
+                # Transient server error - exponential backoff with jitter
+                if attempt < max_retries:
+                    wait_seconds = min(60, 2 ** attempt) + random.uniform(0, 1)
+                    if debug_enabled:
+                        print(f"[!] Chunk upload server error ({response.status_code}). "
+                              f"Retrying in {wait_seconds:.1f}s... ({attempt + 1}/{max_retries})")
+                    time.sleep(wait_seconds)
+                    continue
+
+            # Non-retryable status (4xx) or retries exhausted - fail fast
             raise Exception(f"Chunk upload failed: {response.status_code} - {response.text}")
 
-    except Exception as e:
-        print(f"[!] Error uploading chunk: {str(e)}")
-        if is_debug_metadata_enabled():
-            import traceback
-            print(f"[DEBUG] Traceback: {traceback.format_exc()}")
-        return None
+        except requests.exceptions.RequestException as e:
+            # Connection-level failure (reset, timeout) - retryable
+            if attempt < max_retries:
+                wait_seconds = min(60, 2 ** attempt) + random.uniform(0, 1)
+                if debug_enabled:
+                    print(f"[!] Chunk upload connection error: {e}. "
+                          f"Retrying in {wait_seconds:.1f}s... ({attempt + 1}/{max_retries})")
+                time.sleep(wait_seconds)
+                continue
+            print(f"[!] Error uploading chunk: {str(e)}")
+            if is_debug_metadata_enabled():
+                import traceback
+                print(f"[DEBUG] Traceback: {traceback.format_exc()}")
+            return None
+        except Exception as e:
+            print(f"[!] Error uploading chunk: {str(e)}")
+            if is_debug_metadata_enabled():
+                import traceback
+                print(f"[DEBUG] Traceback: {traceback.format_exc()}")
+            return None
+
+    return None
 
 
 def create_folder_graph(site_id, drive_id, parent_item_id, folder_name,
@@ -2239,6 +2507,91 @@ def create_folder_graph(site_id, drive_id, parent_item_id, folder_name,
         return None
 
 
+def create_folder_path_graph(site_id, drive_id, parent_item_id, folder_path,
+                             tenant_id, client_id, client_secret, login_endpoint, graph_endpoint):
+    """
+    Create the leaf folder of a multi-segment path in a single request.
+
+    Addresses the leaf's parent by path relative to parent_item_id
+    (POST /items/{id}:/{path}:/children), so a deep new path can resolve
+    in one round-trip instead of one create per segment. Quietly returns
+    None when the service rejects the request (e.g. intermediate folders
+    missing, leaf already exists) - callers fall back to the per-segment
+    walk, so this is purely an opportunistic fast path.
+
+    Args:
+        site_id (str): SharePoint site ID
+        drive_id (str): SharePoint drive ID
+        parent_item_id (str): Item ID the path is relative to (usually the upload root)
+        folder_path (str): Multi-segment path, e.g. "a/b/c" (sanitized, forward slashes)
+        tenant_id (str): Azure AD tenant ID
+        client_id (str): Azure AD application client ID
+        client_secret (str): Azure AD application client secret
+        login_endpoint (str): Azure AD login endpoint
+        graph_endpoint (str): Microsoft Graph API endpoint
+
+    Returns:
+        dict: Created leaf folder driveItem metadata (id, name, folder)
+        None: If the single-shot create was not possible
+    """
+    debug_enabled = is_debug_enabled()
+
+    try:
+        import urllib.parse
+
+        parts = [part for part in folder_path.replace('\\', '/').split('/') if part]
+        if len(parts) < 2:
+            return None  # Single segment - the normal create path is already one call
+
+        leaf_name = parts[-1]
+        parent_path = '/'.join(parts[:-1])
+
+        from .auth import acquire_token
+        token = acquire_token(tenant_id, client_id, client_secret, login_endpoint, graph_endpoint)
+        if not token:
+            raise Exception("Failed to acquire authentication token")
+
+        headers = {
+            'Authorization': f"Bearer {token['access_token']}",
+            'Content-Type': 'application/json'
+        }
+
+        encoded_path = urllib.parse.quote(parent_path)
+        create_url = (f"https://{graph_endpoint}/v1.0/sites/{site_id}/drives/{drive_id}"
+                      f"/items/{parent_item_id}:/{encoded_path}:/children")
+
+        # 'fail' on conflict: if the leaf already exists the per-segment walk
+        # should find and cache it rather than auto-renaming a duplicate
+        request_body = {
+            "name": leaf_name,
+            "folder": {},
+            "@microsoft.graph.conflictBehavior": "fail"
+        }
+
+        if debug_enabled:
+            print(f"[DEBUG] Single-shot folder create: {folder_path}")
+
+        create_response = make_graph_request_with_retry(create_url, headers, method='POST', json_data=request_body)
+
+        if create_response.status_code in [200, 201]:
+            folder_data = create_response.json()
+            if debug_enabled:
+                print(f"[DEBUG] Deep folder created in one call: {folder_data.get('id')}")
+            return folder_data
+
+        # 404 (missing intermediates), 409 (exists), 400 etc. - let the
+        # caller walk the path segment by segment instead
+        if debug_enabled:
+            print(f"[DEBUG] Single-shot create not applicable ({create_response.status_code}), "
+                  f"falling back to per-segment walk")
+        return None
+
+    except Exception as e:
+        if debug_enabled:
+            print(f"[DEBUG] Single-shot folder create failed: {str(e)[:200]}")
+        return None
+
+
 def list_folder_children_graph(site_id, drive_id, item_id, tenant_id, client_id,
                                client_secret, login_endpoint, graph_endpoint, folder_path=None):
     """
@@ -2305,6 +2658,227 @@ def list_folder_children_graph(site_id, drive_id, item_id, tenant_id, client_id,
         return None
 
 
+def batch_probe_folder_paths(site_id, drive_id, root_item_id, folder_paths,
+                             tenant_id, client_id, client_secret,
+                             login_endpoint, graph_endpoint, batch_size=20):
+    """
+    Probe many folder paths for existence with Graph $batch requests.
+
+    Instead of one round-trip per folder, packs up to 20 GET sub-requests
+    (Graph's per-batch cap) into a single $batch POST and resolves each
+    path relative to the upload root item.
+
+    Args:
+        site_id (str): SharePoint site ID
+        drive_id (str): SharePoint drive ID
+        root_item_id (str): Item ID the folder paths are relative to
+        folder_paths (list): Relative folder paths to probe (e.g. 'a/b/c')
+        tenant_id (str): Azure AD tenant ID
+        client_id (str): Azure AD application client ID
+        client_secret (str): Azure AD application client secret
+        login_endpoint (str): Azure AD login endpoint
+        graph_endpoint (str): Microsoft Graph API endpoint
+        batch_size (int): Sub-requests per $batch call (max 20 per Graph docs)
+
+    Returns:
+        dict: Mapping of folder path to driveItem dict (found) or None (404).
+            Paths whose sub-request failed with any other status are omitted
+            so callers fall back to the per-folder probe for them.
+        None: If the $batch endpoint itself was unavailable (caller should
+            fall back to per-folder listing entirely).
+    """
+    debug_enabled = is_debug_enabled()
+
+    try:
+        if not folder_paths:
+            return {}
+
+        token = acquire_token(tenant_id, client_id, client_secret, login_endpoint, graph_endpoint)
+        if 'access_token' not in token:
+            print("[!] Failed to acquire token for batch folder probe")
+            return None
+
+        headers = {
+            'Authorization': f"Bearer {token['access_token']}",
+            'Content-Type': 'application/json'
+        }
+
+        import urllib.parse
+        batch_endpoint = f"https://{graph_endpoint}/v1.0/$batch"
+        results = {}
+
+        for batch_start in range(0, len(folder_paths), batch_size):
+            batch_paths = folder_paths[batch_start:batch_start + batch_size]
+
+            # Build the $batch payload; sub-request URLs are relative to /v1.0
+            batch_request = {"requests": []}
+            for idx, path in enumerate(batch_paths):
+                encoded_path = urllib.parse.quote(path)
+                batch_request["requests"].append({
+                    "id": str(idx),
+                    "method": "GET",
+                    "url": f"/sites/{site_id}/drives/{drive_id}/items/{root_item_id}:/{encoded_path}"
+                })
+
+            batch_response = make_graph_request_with_retry(
+                batch_endpoint, headers, method='POST', json_data=batch_request
+            )
+
+            if batch_response.status_code in (400, 501):
+                # $batch not available on this endpoint - let callers fall back
+                print(f"[!] Graph $batch endpoint unavailable ({batch_response.status_code}), falling back to per-folder probes")
+                return None
+
+            if batch_response.status_code != 200:
+                print(f"[!] Batch folder probe failed: {batch_response.status_code}")
+                continue  # Unprobed paths fall back individually
+
+            batch_data = batch_response.json()
+            for sub_response in batch_data.get('responses', []):
+                try:
+                    path = batch_paths[int(sub_response.get('id'))]
+                except (TypeError, ValueError, IndexError):
+                    continue
+                status = sub_response.get('status')
+                if status == 200:
+                    results[path] = sub_response.get('body', {})
+                elif status == 404:
+                    results[path] = None
+                # Other statuses (429, 5xx) are omitted -> per-folder fallback
+
+            if debug_enabled:
+                print(f"[DEBUG] Batch probed {len(batch_paths)} folder path(s) in one request")
+
+        return results
+
+    except Exception as e:
+        print(f"[!] Error during batch folder probe: {str(e)}")
+        if is_debug_metadata_enabled():
+            import traceback
+            print(f"[DEBUG] Traceback: {traceback.format_exc()}")
+        return None
+
+
+def batch_create_folder_paths(site_id, drive_id, root_item_id, folder_paths,
+                              tenant_id, client_id, client_secret,
+                              login_endpoint, graph_endpoint, batch_size=20):
+    """
+    Create many missing folders with Graph $batch requests.
+
+    Packs up to 20 folder-create POSTs per $batch call. Callers must pass
+    folder_paths sorted shallow-first so every parent is created in the
+    same or an earlier chunk than its children; within a chunk, dependsOn
+    links each sub-request to its parent's sub-request so Graph executes
+    them in order.
+
+    Args:
+        site_id (str): SharePoint site ID
+        drive_id (str): SharePoint drive ID
+        root_item_id (str): Item ID the folder paths are relative to
+        folder_paths (list): Relative folder paths to create, depth-sorted
+            shallow-first (e.g. 'a' before 'a/b')
+        tenant_id (str): Azure AD tenant ID
+        client_id (str): Azure AD application client ID
+        client_secret (str): Azure AD application client secret
+        login_endpoint (str): Azure AD login endpoint
+        graph_endpoint (str): Microsoft Graph API endpoint
+        batch_size (int): Sub-requests per $batch call (max 20 per Graph docs)
+
+    Returns:
+        dict: Mapping of folder path to the created driveItem dict. Paths
+            whose sub-request failed for any reason (including 409 when a
+            concurrent writer won the race) are omitted, so callers keep
+            their per-folder creation fallback for them.
+        None: If the $batch endpoint itself was unavailable.
+    """
+    debug_enabled = is_debug_enabled()
+
+    try:
+        if not folder_paths:
+            return {}
+
+        token = acquire_token(tenant_id, client_id, client_secret, login_endpoint, graph_endpoint)
+        if 'access_token' not in token:
+            print("[!] Failed to acquire token for batch folder creation")
+            return None
+
+        headers = {
+            'Authorization': f"Bearer {token['access_token']}",
+            'Content-Type': 'application/json'
+        }
+
+        import urllib.parse
+        batch_endpoint = f"https://{graph_endpoint}/v1.0/$batch"
+        results = {}
+
+        for batch_start in range(0, len(folder_paths), batch_size):
+            batch_paths = folder_paths[batch_start:batch_start + batch_size]
+            # Sub-request id per path, for dependsOn links within this chunk
+            id_by_path = {path: str(idx) for idx, path in enumerate(batch_paths)}
+
+            batch_request = {"requests": []}
+            for idx, path in enumerate(batch_paths):
+                parent_path, _, leaf = path.rpartition('/')
+                if parent_path:
+                    encoded_parent = urllib.parse.quote(parent_path)
+                    url = f"/sites/{site_id}/drives/{drive_id}/items/{root_item_id}:/{encoded_parent}:/children"
+                else:
+                    url = f"/sites/{site_id}/drives/{drive_id}/items/{root_item_id}/children"
+                sub_request = {
+                    "id": str(idx),
+                    "method": "POST",
+                    "url": url,
+                    "headers": {"Content-Type": "application/json"},
+                    "body": {
+                        "name": leaf,
+                        "folder": {},
+                        "@microsoft.graph.conflictBehavior": "fail"
+                    }
+                }
+                # Parent being created in the same chunk -> order explicitly
+                if parent_path in id_by_path:
+                    sub_request["dependsOn"] = [id_by_path[parent_path]]
+                batch_request["requests"].append(sub_request)
+
+            batch_response = make_graph_request_with_retry(
+                batch_endpoint, headers, method='POST', json_data=batch_request
+            )
+
+            if batch_response.status_code in (400, 501):
+                # $batch not available on this endpoint - let callers fall back
+                print(f"[!] Graph $batch endpoint unavailable ({batch_response.status_code}), falling back to per-folder creation")
+                return None
+
+            if batch_response.status_code != 200:
+                print(f"[!] Batch folder creation failed: {batch_response.status_code}")
+                continue  # Uncreated paths fall back individually
+
+            created_count = 0
+            batch_data = batch_response.json()
+            for sub_response in batch_data.get('responses', []):
+                try:
+                    path = batch_paths[int(sub_response.get('id'))]
+                except (TypeError, ValueError, IndexError):
+                    continue
+                if sub_response.get('status') == 201:
+                    results[path] = sub_response.get('body', {})
+                    created_count += 1
+                # 409 (already exists) and other statuses are omitted ->
+                # ensure_folder_exists resolves or creates them individually
+
+            if debug_enabled:
+                print(f"[DEBUG] Batch created {created_count}/{len(batch_paths)} folder(s) in one request")
+
+        return results
+
+    except Exception as e:
+        print(f"[!] Error during batch folder creation: {str(e)}")
+        if is_debug_metadata_enabled():
+            import traceback
+            print(f"[DEBUG] Traceback: {traceback.format_exc()}")
+        return None
+
+
 def batch_update_filehash_fields(site_url, list_name, updates_list,
                                  tenant_id, client_id, client_secret,
                                  login_endpoint, graph_endpoint, batch_size=20,
@@ -2383,18 +2957,10 @@ def batch_update_filehash_fields(site_url, list_name, updates_list,
             return {(parent_id, filename): False for parent_id, filename, _, _, _ in updates_list}
 
         lists_data = lists_response.json()
-        list_id = None
-        drive_id = None
 
-        for sp_list in lists_data.get('value', []):
-            if sp_list.get('displayName') == list_name or sp_list.get('name') == list_name:
-                list_id = sp_list.get('id')
-                # Document libraries have an associated drive
-                drive_info = sp_list.get('list', {}).get('template')
-                if drive_info == 'documentLibrary' or 'drive' in sp_list:
-                    # Get the drive from the list's drive property
-                    drive_id = sp_list.get('id')  # For document libraries, list ID = drive ID
-                break
+        list_id, list_name = resolve_list_id(site_id, lists_data, list_name)
+        # Placeholder until the real drive ID is resolved from /drives below
+        drive_id = list_id
 
         if not list_id:
             print(f"[!] Could not find list '{list_name}' for batch updates")
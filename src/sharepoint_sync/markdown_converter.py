@@ -8,10 +8,261 @@ and renders Mermaid diagrams as embedded SVG images.
 
 import os
 import re
+import hashlib
 import tempfile
 import subprocess
 import mistune
 
+from .utils import is_debug_enabled
+
+# On-disk cache of rendered SVGs keyed by diagram content hash.
+# mmdc output is a pure function of its input, so identical blocks
+# (templated diagrams repeated across files, or CI re-runs on a runner
+# with a warm temp dir) only pay the render cost once.
+_MMD_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'mmd-cache')
+
+# Scratch directory for the .mmd/.svg files exchanged with mmdc. Prefer
+# /dev/shm (tmpfs, stays in RAM) so the per-diagram round trip avoids the
+# slow overlay filesystem on CI runners; None falls back to the default
+# temp dir.
+_MMD_SCRATCH_DIR = '/dev/shm' if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK) else None
+
+# Patterns used once per mermaid block / per document - compiled at import
+# so the hot conversion path skips re's per-call cache lookup
+_MERMAID_RE = re.compile(r'```mermaid\n(.*?)\n```', re.DOTALL)
+_XMLDECL_RE = re.compile(r'<\?xml[^>]*\?>')
+
+# Matches a diagram placeholder in the mistune output, preferring the
+# paragraph-wrapped form so the wrapping <p></p> is consumed with it
+_MERMAID_PLACEHOLDER_RE = re.compile(
+    r'<p><!--MERMAID_PLACEHOLDER_(\d+)--></p>|<!--MERMAID_PLACEHOLDER_(\d+)-->')
+
+# Full HTML document shell with GitHub-like CSS. The styling is static;
+# only the title and body vary per document, so the template is built
+# once at import and filled with a single format_map() call instead of
+# re-interpolating the whole ~6 KB string through an f-string per file.
+_HTML_TEMPLATE = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    <title>{title}</title>
+
+    <style>
+        /* GitHub-like styling for SharePoint */
+        body {{
+            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", "Noto Sans", Helvetica, Arial, sans-serif;
+            font-size: 16px;
+            line-height: 1.5;
+            word-wrap: break-word;
+            padding: 20px;
+            max-width: 980px;
+            margin: 0 auto;
+            color: #1F2328;
+            background: #ffffff;
+        }}
+
+        h1, h2, h3, h4, h5, h6 {{
+            margin-top: 24px;
+            margin-bottom: 16px;
+            font-weight: 600;
+            line-height: 1.25;
+        }}
+
+        h1 {{
+            font-size: 2em;
+            border-bottom: 1px solid #d1d9e0;
+            padding-bottom: .3em;
+        }}
+
+        h2 {{
+            font-size: 1.5em;
+            border-bottom: 1px solid #d1d9e0;
+            padding-bottom: .3em;
+        }}
+
+        h3 {{ font-size: 1.25em; }}
+        h4 {{ font-size: 1em; }}
+        h5 {{ font-size: .875em; }}
+        h6 {{ font-size: .85em; color: #59636e; }}
+
+        code {{
+            padding: .2em .4em;
+            margin: 0;
+            font-size: 85%;
+            white-space: break-spaces;
+            background-color: #f6f8fa;
+            border-radius: 6px;
+            font-family: ui-monospace, SFMono-Regular, "SF Mono", Consolas, "Liberation Mono", Menlo, monospace;
+        }}
+
+        pre {{
+            padding: 16px;
+            overflow: auto;
+            font-size: 85%;
+            line-height: 1.45;
+            color: #1F2328;
+            background-color: #f6f8fa;
+            border-radius: 6px;
+            margin-top: 0;
+            margin-bottom: 16px;
+        }}
+
+        pre code {{
+            display: inline;
+            max-width: auto;
+            padding: 0;
+            margin: 0;
+            overflow: visible;
+            line-height: inherit;
+            word-wrap: normal;
+            background-color: transparent;
+            border: 0;
+        }}
+
+        blockquote {{
+            margin: 0;
+            padding: 0 1em;
+            color: #59636e;
+            border-left: .25em solid #d1d9e0;
+        }}
+
+        table {{
+            border-spacing: 0;
+            border-collapse: collapse;
+            display: block;
+            width: max-content;
+            max-width: 100%;
+            overflow: auto;
+            margin-top: 0;
+            margin-bottom: 16px;
+        }}
+
+        table th {{
+            font-weight: 600;
+            padding: 6px 13px;
+            border: 1px solid #d1d9e0;
+            background-color: #f6f8fa;
+        }}
+
+        table td {{
+            padding: 6px 13px;
+            border: 1px solid #d1d9e0;
+        }}
+
+        table tr:nth-child(2n) {{
+            background-color: #f6f8fa;
+        }}
+
+        ul, ol {{
+            margin-top: 0;
+            margin-bottom: 16px;
+            padding-left: 2em;
+        }}
+
+        ul ul, ul ol, ol ol, ol ul {{
+            margin-top: 0;
+            margin-bottom: 0;
+        }}
+
+        li > p {{
+            margin-top: 16px;
+        }}
+
+        a {{
+            color: #0969da;
+            text-decoration: none;
+        }}
+
+        a:hover {{
+            text-decoration: underline;
+        }}
+
+        hr {{
+            height: .25em;
+            padding: 0;
+            margin: 24px 0;
+            background-color: #d1d9e0;
+            border: 0;
+        }}
+
+        img {{
+            max-width: 100%;
+            box-sizing: content-box;
+        }}
+
+        /* Mermaid diagram container */
+        .mermaid-diagram {{
+            text-align: center;
+            margin: 16px 0;
+            padding: 16px;
+            background-color: #f6f8fa;
+            border-radius: 6px;
+            overflow-x: auto;
+        }}
+
+        .mermaid-diagram svg {{
+            max-width: 100%;
+            height: auto;
+        }}
+
+        /* Task list items */
+        .task-list-item {{
+            list-style-type: none;
+        }}
+
+        .task-list-item input {{
+            margin: 0 .2em .25em -1.4em;
+            vertical-align: middle;
+        }}
+
+    </style>
+</head>
+<body>
+    {html_body}
+</body>
+</html>'''
+
+
+def _mmd_cache_get(cache_key):
+    """
+    Look up a previously rendered SVG by content hash.
+
+    Args:
+        cache_key (str): Hex digest of the mermaid source
+
+    Returns:
+        str: Cached SVG content, or None on miss or any read error
+    """
+    try:
+        with open(os.path.join(_MMD_CACHE_DIR, cache_key + '.svg'),
+                  'r', encoding='utf-8') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _mmd_cache_put(cache_key, svg_content):
+    """
+    Store a rendered SVG under its content hash.
+
+    Written to a temp file first and moved into place with os.replace()
+    so concurrent conversion workers never observe a partial file.
+    Cache failures are ignored - caching is purely an optimization.
+
+    Args:
+        cache_key (str): Hex digest of the mermaid source
+        svg_content (str): Rendered SVG to store
+    """
+    try:
+        os.makedirs(_MMD_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix='.svg', dir=_MMD_CACHE_DIR)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(svg_content)
+        os.replace(tmp_path, os.path.join(_MMD_CACHE_DIR, cache_key + '.svg'))
+    except OSError:
+        pass
+
 
 def sanitize_mermaid_code(mermaid_code):
     """
@@ -214,6 +465,85 @@ def sanitize_mermaid_code(mermaid_code):
     return sanitized
 
 
+def render_mermaid_blocks_batch(mermaid_codes, filename=None):
+    """
+    Render all Mermaid diagrams of one document with a single mmdc run.
+
+    Every mmdc invocation pays the Node + Puppeteer + Chromium startup cost
+    (commonly 1-3s) while the actual SVG rendering takes milliseconds, so a
+    document with many diagrams spends nearly all its time relaunching the
+    browser. mmdc's markdown mode renders every ```mermaid block in a file
+    in one invocation; this helper feeds it a synthetic document containing
+    just the diagrams and collects the emitted SVG files in order.
+
+    Strictly opportunistic: any problem (one bad diagram fails the whole
+    mmdc run, unexpected output naming, timeout) returns None so the caller
+    falls back to the per-diagram path with its sanitize-and-retry handling.
+
+    Args:
+        mermaid_codes (list): Mermaid source blocks in document order
+        filename (str, optional): Original filename for debug messages
+
+    Returns:
+        list: SVG content strings matching mermaid_codes order
+        None: If batch rendering was not possible (caller should fall back)
+    """
+    if not mermaid_codes or len(mermaid_codes) < 2:
+        return None  # Single diagram gains nothing over the per-diagram path
+
+    import shutil
+
+    tmpdir = None
+    try:
+        tmpdir = tempfile.mkdtemp(prefix='mmdc_batch_', dir=_MMD_SCRATCH_DIR)
+        in_md = os.path.join(tmpdir, 'in.md')
+        out_md = os.path.join(tmpdir, 'out.md')
+
+        with open(in_md, 'w', encoding='utf-8') as f:
+            for code in mermaid_codes:
+                f.write(f"```mermaid\n{code}\n```\n\n")
+
+        subprocess.run(
+            ['mmdc', '-i', in_md, '-o', out_md,
+             '--puppeteerConfigFile', '/usr/src/app/puppeteer-config.json',
+             '--configFile', '/usr/src/app/mermaid-config.json'],
+            capture_output=True,
+            text=True,
+            timeout=max(60, 30 * len(mermaid_codes)),
+            check=True
+        )
+
+        # mmdc names the rendered files after the output stem with a 1-based
+        # index; collect them by that index so order matches the source blocks
+        svg_by_index = {}
+        for entry in os.listdir(tmpdir):
+            match = re.match(r'out-(\d+)\.svg$', entry)
+            if match:
+                with open(os.path.join(tmpdir, entry), 'r', encoding='utf-8') as f:
+                    svg_by_index[int(match.group(1))] = f.read()
+
+        if len(svg_by_index) != len(mermaid_codes):
+            if is_debug_enabled():
+                print(f"[!] Mermaid batch render produced {len(svg_by_index)} SVGs "
+                      f"for {len(mermaid_codes)} diagrams - falling back to per-diagram rendering")
+            return None
+
+        return [svg_by_index[i] for i in range(1, len(mermaid_codes) + 1)]
+
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired,
+            FileNotFoundError, OSError, KeyError) as e:
+        # Includes the one-bad-diagram case: the per-diagram fallback will
+        # render the good ones and sanitize/report the bad one as before
+        if is_debug_enabled():
+            name_note = f" in {filename}" if filename else ""
+            print(f"[!] Mermaid batch render failed{name_note} ({type(e).__name__}) - "
+                  f"falling back to per-diagram rendering")
+        return None
+    finally:
+        if tmpdir:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+
 def convert_mermaid_to_svg(mermaid_code, filename=None):
     """
     Convert Mermaid diagram code to SVG using mermaid-cli.
@@ -252,7 +582,8 @@ def convert_mermaid_to_svg(mermaid_code, filename=None):
 
         try:
             # Create temporary files for input and output
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.mmd', delete=False) as mmd_file:
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.mmd', delete=False,
+                                             dir=_MMD_SCRATCH_DIR) as mmd_file:
                 mmd_file.write(code)
                 mmd_path = mmd_file.name
 
@@ -305,12 +636,22 @@ def convert_mermaid_to_svg(mermaid_code, filename=None):
             # These errors should not be retried with sanitization
             return False, e
 
+    # Check the render cache before spawning mmdc - identical diagram
+    # source always produces the same SVG
+    cache_key = hashlib.sha256(mermaid_code.encode('utf-8')).hexdigest()
+    cached_svg = _mmd_cache_get(cache_key)
+    if cached_svg is not None:
+        if is_debug_enabled():
+            print(f"[DEBUG] Mermaid render cache hit ({cache_key[:12]})")
+        return cached_svg
+
     try:
         # FIRST ATTEMPT: Try converting original diagram as-is
         success, result = attempt_conversion(mermaid_code, is_sanitized=False)
 
         if success:
             # Original diagram converted successfully
+            _mmd_cache_put(cache_key, result)
             return result
 
         # Check if the error is a syntax error (CalledProcessError)
@@ -325,8 +666,11 @@ def convert_mermaid_to_svg(mermaid_code, filename=None):
             success, result = attempt_conversion(sanitized_code, is_sanitized=True)
 
             if success:
-                # Sanitized diagram converted successfully
+                # Sanitized diagram converted successfully - cache under the
+                # ORIGINAL source hash so the next encounter skips both the
+                # failed attempt and the sanitize-and-retry
                 print(f"[OK] Mermaid diagram converted successfully after sanitization")
+                _mmd_cache_put(cache_key, result)
                 return result
 
             # Both attempts failed - show detailed error
@@ -574,6 +918,48 @@ def rewrite_markdown_links(md_content, sharepoint_base_url=None, current_file_re
     return md_content
 
 
+def _render_mermaid_codes(mermaid_codes, filename=None):
+    """
+    Render a document's mermaid blocks to SVG, fastest path first.
+
+    Tries the single-invocation batch render (one Chromium startup for the
+    whole document), then parallel per-diagram renders, then a sequential
+    per-diagram loop. The per-diagram converter keeps its sanitize-and-retry
+    handling in every fallback.
+
+    Args:
+        mermaid_codes (list): Mermaid source blocks in document order
+        filename (str, optional): Original filename for error messages
+
+    Returns:
+        list: SVG string or None per block, matching mermaid_codes order
+    """
+    if not mermaid_codes:
+        return []
+
+    rendered = render_mermaid_blocks_batch(mermaid_codes, filename)
+    if rendered is not None:
+        return rendered
+
+    if len(mermaid_codes) >= 2:
+        # Batch render unavailable - run the per-diagram conversions in
+        # parallel instead. Each render is an independent mmdc process, so
+        # this is embarrassingly parallel; workers are capped low because
+        # every render spawns its own Chromium and files are already
+        # converted in parallel by convert_markdown_files_parallel.
+        try:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(4, len(mermaid_codes))) as pool:
+                return list(pool.map(
+                    lambda code: convert_mermaid_to_svg(code, filename),
+                    mermaid_codes))
+        except Exception as e:
+            if is_debug_enabled():
+                print(f"[DEBUG] Parallel mermaid rendering failed: {e}")
+
+    return [convert_mermaid_to_svg(code, filename) for code in mermaid_codes]
+
+
 def convert_markdown_to_html(md_content, filename, sharepoint_base_url=None, current_file_rel_path=None):
     """
     Convert Markdown content to HTML with Mermaid diagrams rendered as SVG.
@@ -598,23 +984,51 @@ def convert_markdown_to_html(md_content, filename, sharepoint_base_url=None, cur
     """
     # Rewrite internal markdown links before conversion
     md_content = rewrite_markdown_links(md_content, sharepoint_base_url, current_file_rel_path)
-    # First, extract and convert all mermaid blocks to placeholder SVGs
-    mermaid_pattern = r'```mermaid\n(.*?)\n```'
+    # First, extract all mermaid blocks and kick off their rendering
     mermaid_blocks = []
     mermaid_success_count = 0
     mermaid_failed_count = 0
 
+    mermaid_codes = _MERMAID_RE.findall(md_content)
+
+    # Diagram rendering (external mmdc processes) and mistune parsing are
+    # independent, so start the renders on a background thread and run the
+    # markdown conversion concurrently instead of back to back
+    svg_future = None
+    render_pool = None
+    if mermaid_codes:
+        try:
+            from concurrent.futures import ThreadPoolExecutor
+            render_pool = ThreadPoolExecutor(max_workers=1)
+            svg_future = render_pool.submit(_render_mermaid_codes, mermaid_codes, filename)
+        except Exception:
+            svg_future = None
+
+    # Replace mermaid blocks with numbered placeholders (no rendering here)
+    placeholder_index = [0]
+
     def replace_mermaid_with_placeholder(match):
-        nonlocal mermaid_success_count, mermaid_failed_count
-        mermaid_code = match.group(1)
-        placeholder = f"<!--MERMAID_PLACEHOLDER_{len(mermaid_blocks)}-->"
+        placeholder = f"<!--MERMAID_PLACEHOLDER_{placeholder_index[0]}-->"
+        placeholder_index[0] += 1
+        return placeholder
+
+    md_with_placeholders = _MERMAID_RE.sub(replace_mermaid_with_placeholder, md_content)
+
+    # Convert markdown to HTML using Mistune (overlaps the diagram renders)
+    html_body = mistune.html(md_with_placeholders)
 
-        # Convert to SVG
-        svg_content = convert_mermaid_to_svg(mermaid_code, filename)
+    # Collect the rendered SVGs and build the splice list
+    if svg_future is not None:
+        rendered = svg_future.result()
+        render_pool.shutdown()
+    else:
+        rendered = _render_mermaid_codes(mermaid_codes, filename)
+
+    for mermaid_code, svg_content in zip(mermaid_codes, rendered):
         if svg_content:
             # Clean up the SVG for inline embedding
             # Remove XML declaration if present
-            svg_content = re.sub(r'<\?xml[^>]*\?>', '', svg_content)
+            svg_content = _XMLDECL_RE.sub('', svg_content)
             svg_content = svg_content.strip()
             mermaid_blocks.append(svg_content)
             mermaid_success_count += 1
@@ -623,204 +1037,19 @@ def convert_markdown_to_html(md_content, filename, sharepoint_base_url=None, cur
             mermaid_blocks.append(f'<pre><code>mermaid\n{mermaid_code}</code></pre>')
             mermaid_failed_count += 1
 
-        return placeholder
-
-    # Replace mermaid blocks with placeholders
-    md_with_placeholders = re.sub(mermaid_pattern, replace_mermaid_with_placeholder, md_content, flags=re.DOTALL)
-
-    # Convert markdown to HTML using Mistune
-    html_body = mistune.html(md_with_placeholders)
-
-    # Replace placeholders with actual SVG content
-    for i, svg_content in enumerate(mermaid_blocks):
-        placeholder = f"<!--MERMAID_PLACEHOLDER_{i}-->"
+    # Replace placeholders with actual SVG content in one linear pass
+    # instead of two full-document str.replace scans per diagram
+    def splice_svg(match):
+        index = int(match.group(1) or match.group(2))
         # Wrap SVG in a div for centering
-        wrapped_svg = f'<div class="mermaid-diagram">{svg_content}</div>'
-        html_body = html_body.replace(f"<p>{placeholder}</p>", wrapped_svg)
-        html_body = html_body.replace(placeholder, wrapped_svg)
-
-    # Create the complete HTML document
-    html_template = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1">
-    <title>{filename.replace('.md', '')}</title>
-
-    <style>
-        /* GitHub-like styling for SharePoint */
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", "Noto Sans", Helvetica, Arial, sans-serif;
-            font-size: 16px;
-            line-height: 1.5;
-            word-wrap: break-word;
-            padding: 20px;
-            max-width: 980px;
-            margin: 0 auto;
-            color: #1F2328;
-            background: #ffffff;
-        }}
-
-        h1, h2, h3, h4, h5, h6 {{
-            margin-top: 24px;
-            margin-bottom: 16px;
-            font-weight: 600;
-            line-height: 1.25;
-        }}
+        return f'<div class="mermaid-diagram">{mermaid_blocks[index]}</div>'
 
-        h1 {{
-            font-size: 2em;
-            border-bottom: 1px solid #d1d9e0;
-            padding-bottom: .3em;
-        }}
+    if mermaid_blocks:
+        html_body = _MERMAID_PLACEHOLDER_RE.sub(splice_svg, html_body)
 
-        h2 {{
-            font-size: 1.5em;
-            border-bottom: 1px solid #d1d9e0;
-            padding-bottom: .3em;
-        }}
-
-        h3 {{ font-size: 1.25em; }}
-        h4 {{ font-size: 1em; }}
-        h5 {{ font-size: .875em; }}
-        h6 {{ font-size: .85em; color: #59636e; }}
-
-        code {{
-            padding: .2em .4em;
-            margin: 0;
-            font-size: 85%;
-            white-space: break-spaces;
-            background-color: #f6f8fa;
-            border-radius: 6px;
-            font-family: ui-monospace, SFMono-Regular, "SF Mono", Consolas, "Liberation Mono", Menlo, monospace;
-        }}
-
-        pre {{
-            padding: 16px;
-            overflow: auto;
-            font-size: 85%;
-            line-height: 1.45;
-            color: #1F2328;
-            background-color: #f6f8fa;
-            border-radius: 6px;
-            margin-top: 0;
-            margin-bottom: 16px;
-        }}
-
-        pre code {{
-            display: inline;
-            max-width: auto;
-            padding: 0;
-            margin: 0;
-            overflow: visible;
-            line-height: inherit;
-            word-wrap: normal;
-            background-color: transparent;
-            border: 0;
-        }}
-
-        blockquote {{
-            margin: 0;
-            padding: 0 1em;
-            color: #59636e;
-            border-left: .25em solid #d1d9e0;
-        }}
-
-        table {{
-            border-spacing: 0;
-            border-collapse: collapse;
-            display: block;
-            width: max-content;
-            max-width: 100%;
-            overflow: auto;
-            margin-top: 0;
-            margin-bottom: 16px;
-        }}
-
-        table th {{
-            font-weight: 600;
-            padding: 6px 13px;
-            border: 1px solid #d1d9e0;
-            background-color: #f6f8fa;
-        }}
-
-        table td {{
-            padding: 6px 13px;
-            border: 1px solid #d1d9e0;
-        }}
-
-        table tr:nth-child(2n) {{
-            background-color: #f6f8fa;
-        }}
-
-        ul, ol {{
-            margin-top: 0;
-            margin-bottom: 16px;
-            padding-left: 2em;
-        }}
-
-        ul ul, ul ol, ol ol, ol ul {{
-            margin-top: 0;
-            margin-bottom: 0;
-        }}
-
-        li > p {{
-            margin-top: 16px;
-        }}
-
-        a {{
-            color: #0969da;
-            text-decoration: none;
-        }}
-
-        a:hover {{
-            text-decoration: underline;
-        }}
-
-        hr {{
-            height: .25em;
-            padding: 0;
-            margin: 24px 0;
-            background-color: #d1d9e0;
-            border: 0;
-        }}
-
-        img {{
-            max-width: 100%;
-            box-sizing: content-box;
-        }}
-
-        /* Mermaid diagram container */
-        .mermaid-diagram {{
-            text-align: center;
-            margin: 16px 0;
-            padding: 16px;
-            background-color: #f6f8fa;
-            border-radius: 6px;
-            overflow-x: auto;
-        }}
-
-        .mermaid-diagram svg {{
-            max-width: 100%;
-            height: auto;
-        }}
-
-        /* Task list items */
-        .task-list-item {{
-            list-style-type: none;
-        }}
-
-        .task-list-item input {{
-            margin: 0 .2em .25em -1.4em;
-            vertical-align: middle;
-        }}
-
-    </style>
-</head>
-<body>
-    {html_body}
-</body>
-</html>'''
+    # Create the complete HTML document from the precomputed template
+    html_template = _HTML_TEMPLATE.format_map(
+        {'title': filename.replace('.md', ''), 'html_body': html_body})
 
     return html_template, mermaid_success_count, mermaid_failed_count
 
@@ -959,13 +1188,13 @@ def convert_markdown_to_html_tempfile(md_path, output_dir=None):
                 prefix='md_convert_'
             )
 
-        # Write HTML content
+        # Write HTML content: encode once and hand the whole buffer to the
+        # descriptor directly - one write syscall, no buffered text wrapper
+        # holding a second copy of the document
         try:
-            with os.fdopen(fd, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-        except Exception as write_error:
+            os.write(fd, html_content.encode('utf-8'))
+        finally:
             os.close(fd)
-            raise write_error
 
         return True, html_path
 
@@ -373,21 +373,24 @@ class UploadStatistics:
             print(f"   - Sync efficiency: {efficiency:.1f}% (bandwidth saved by smart sync)")
 
 
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+
 def format_bytes(bytes_value):
     """
     Convert bytes to human-readable format.
 
+    Picks the unit straight from the value's bit length (each unit step is
+    10 bits) instead of dividing in a loop.
+
     Args:
         bytes_value (int): Number of bytes to format
 
     Returns:
         str: Human-readable string (e.g., "1.5 MB")
     """
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if bytes_value < 1024.0:
-            return f"{bytes_value:.1f} {unit}"
-        bytes_value /= 1024.0
-    return f"{bytes_value:.1f} TB"
+    idx = min(len(_BYTE_UNITS) - 1, max(0, (int(bytes_value).bit_length() - 1) // 10))
+    return f"{bytes_value / (1 << (10 * idx)):.1f} {_BYTE_UNITS[idx]}"
 
 
 # Global upload statistics instance
@@ -16,12 +16,18 @@ from .thread_utils import (
     BatchQueue,
     enable_thread_safe_print
 )
-from .uploader import upload_file_with_structure, upload_file
+from .uploader import upload_file_with_structure, upload_file, prefetch_folder_probes
 from .markdown_converter import convert_markdown_to_html, rewrite_markdown_links
 from .file_handler import sanitize_path_components
 from .utils import is_debug_enabled
 from .monitoring import rate_monitor
 
+# File-type groups used to pick post-upload processing delays. Frozensets
+# give O(1) membership checks against a single os.path.splitext() result,
+# replacing one endswith() scan per candidate suffix per filename.
+_OFFICE_EXTS = frozenset(('.docx', '.xlsx', '.pptx', '.doc', '.xls', '.ppt'))
+_IMAGE_EXTS = frozenset(('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.webp', '.tiff'))
+
 
 class ParallelUploader:
     """
@@ -112,15 +118,51 @@ class ParallelUploader:
         md_files = []
         regular_files = []
 
+        # discover_files() already stat'ed every entry and only passes
+        # regular files, so the per-file isfile() here was one redundant
+        # syscall per file; the conversion flag is loop-invariant too
+        convert_md = config.convert_md_to_html
         for f in local_files:
-            if os.path.isfile(f):
-                if f.lower().endswith('.md') and config.convert_md_to_html:
-                    md_files.append(f)
-                else:
-                    regular_files.append(f)
+            if convert_md and os.path.splitext(f)[1].lower() == '.md':
+                md_files.append(f)
+            else:
+                regular_files.append(f)
 
         failed_count = 0
 
+        # Batch-probe the run's folder structure up front: 20 existence
+        # checks per $batch request instead of one listing per path segment
+        # inside ensure_folder_exists. Folders already known from the
+        # metadata cache are skipped by the prefetch itself.
+        dir_paths = set()
+        file_target_dirs = {}
+        for f in md_files + regular_files:
+            rel_path = os.path.relpath(f, base_path) if base_path else f
+            dir_path = os.path.dirname(sanitize_path_components(rel_path.replace('\\', '/')))
+            file_target_dirs[f] = dir_path
+            if dir_path and dir_path != ".":
+                dir_paths.add(dir_path)
+
+        # Group files by target folder before dispatching: workers then hit
+        # same-folder files back to back, so the per-folder children and
+        # metadata indexes stay hot instead of bouncing between folders
+        md_files.sort(key=lambda f: (file_target_dirs.get(f, ''), f))
+        regular_files.sort(key=lambda f: (file_target_dirs.get(f, ''), f))
+
+        if dir_paths:
+            try:
+                prefetch_folder_probes(
+                    site_id, drive_id, root_item_id, dir_paths,
+                    config.tenant_id, config.client_id, config.client_secret,
+                    config.login_endpoint, config.graph_endpoint,
+                    folder_cache=self.folder_cache
+                )
+            except Exception as probe_error:
+                # Prefetch is purely an optimization - per-folder probing
+                # inside ensure_folder_exists still covers everything
+                if is_debug_enabled():
+                    print(f"[DEBUG] Folder prefetch failed (non-fatal): {probe_error}")
+
         # Process markdown files first (may need conversion)
         if md_files:
             md_start_time = time.time()
@@ -298,7 +340,7 @@ class ParallelUploader:
 
             try:
                 # Preprocess raw markdown files to rewrite links
-                if filepath.lower().endswith('.md'):
+                if os.path.splitext(filepath)[1].lower() == '.md':
                     preprocessed_path = self._preprocess_markdown_file(filepath, base_path, config)
                     if preprocessed_path != filepath:
                         # A temp file was created
@@ -558,31 +600,32 @@ class ParallelUploader:
             # This allows hash-based comparison instead of size-only (solves Mermaid SVG ID variation issue)
             # Force upload if force_md_to_html_regeneration is true (always upload newly regenerated HTML)
             force_html_upload = config.force_upload or config.force_md_to_html_regeneration
-            for i in range(config.max_retry):
-                try:
-                    upload_file(
-                        site_id, drive_id, target_folder_id, html_path, 4*1024*1024, force_html_upload,
-                        config.tenant_url, library_name, filehash_available,
-                        config.tenant_id, config.client_id, config.client_secret,
-                        config.login_endpoint, config.graph_endpoint,
-                        self.stats_wrapper, desired_name=desired_html_filename,
-                        metadata_queue=self.metadata_queue,  # Pass queue for batch updates
-                        pre_calculated_hash=md_file_hash,  # Use source .md file hash for comparison
-                        display_path=sanitized_rel_path,  # Show full relative path in debug output
-                        sharepoint_cache=self.sharepoint_cache  # Pass cache for instant lookups
-                    )
-                    break
-                except Exception as e:
-                    if i == config.max_retry - 1:
-                        print(f"[Error] Failed to upload {original_html_path} after {config.max_retry} attempts")
-                        raise e
-                    else:
-                        print(f"[!] Retrying upload... ({i+1}/{config.max_retry})")
-                        time.sleep(2)
-
-            # Clean up temp file
-            if os.path.exists(html_path):
-                os.remove(html_path)
+            try:
+                for i in range(config.max_retry):
+                    try:
+                        upload_file(
+                            site_id, drive_id, target_folder_id, html_path, 4*1024*1024, force_html_upload,
+                            config.tenant_url, library_name, filehash_available,
+                            config.tenant_id, config.client_id, config.client_secret,
+                            config.login_endpoint, config.graph_endpoint,
+                            self.stats_wrapper, desired_name=desired_html_filename,
+                            metadata_queue=self.metadata_queue,  # Pass queue for batch updates
+                            pre_calculated_hash=md_file_hash,  # Use source .md file hash for comparison
+                            display_path=sanitized_rel_path,  # Show full relative path in debug output
+                            sharepoint_cache=self.sharepoint_cache  # Pass cache for instant lookups
+                        )
+                        break
+                    except Exception as e:
+                        if i == config.max_retry - 1:
+                            print(f"[Error] Failed to upload {original_html_path} after {config.max_retry} attempts")
+                            raise e
+                        else:
+                            print(f"[!] Retrying upload... ({i+1}/{config.max_retry})")
+                            time.sleep(2)
+            finally:
+                # Clean up temp file even when the upload ultimately fails
+                if os.path.exists(html_path):
+                    os.remove(html_path)
 
             self.stats_wrapper.increment('md_converted')
             return True
@@ -633,14 +676,17 @@ class ParallelUploader:
         if remaining:
             # Add delay for complex file types to allow SharePoint processing to complete
             # Different file types need processing time: virus scan, content indexing, conversion, sanitization
-            html_count = sum(1 for _, filename, _, _, _, _ in remaining
-                           if filename.lower().endswith('.html'))
-            pdf_count = sum(1 for _, filename, _, _, _, _ in remaining
-                          if filename.lower().endswith('.pdf'))
-            office_count = sum(1 for _, filename, _, _, _, _ in remaining
-                              if any(filename.lower().endswith(ext) for ext in ['.docx', '.xlsx', '.pptx', '.doc', '.xls', '.ppt']))
-            image_count = sum(1 for _, filename, _, _, _, _ in remaining
-                             if any(filename.lower().endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.webp', '.tiff']))
+            html_count = pdf_count = office_count = image_count = 0
+            for _, filename, _, _, _, _ in remaining:
+                ext = os.path.splitext(filename)[1].lower()
+                if ext == '.html':
+                    html_count += 1
+                elif ext == '.pdf':
+                    pdf_count += 1
+                elif ext in _OFFICE_EXTS:
+                    office_count += 1
+                elif ext in _IMAGE_EXTS:
+                    image_count += 1
             complex_count = html_count + pdf_count + office_count + image_count
             total_count = len(remaining)
 
@@ -721,10 +767,17 @@ class ParallelUploader:
 
             # Categorize failed items by file type for appropriate retry delays
             if failed_items:
-                html_count = sum(1 for _, f, _, _, _ in failed_items if f.lower().endswith('.html'))
-                pdf_count = sum(1 for _, f, _, _, _ in failed_items if f.lower().endswith('.pdf'))
-                office_count = sum(1 for _, f, _, _, _ in failed_items if any(f.lower().endswith(ext) for ext in ['.docx', '.xlsx', '.pptx', '.doc', '.xls', '.ppt']))
-                image_count = sum(1 for _, f, _, _, _ in failed_items if any(f.lower().endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.webp', '.tiff']))
+                html_count = pdf_count = office_count = image_count = 0
+                for _, f, _, _, _ in failed_items:
+                    ext = os.path.splitext(f)[1].lower()
+                    if ext == '.html':
+                        html_count += 1
+                    elif ext == '.pdf':
+                        pdf_count += 1
+                    elif ext in _OFFICE_EXTS:
+                        office_count += 1
+                    elif ext in _IMAGE_EXTS:
+                        image_count += 1
                 other_count = len(failed_items) - html_count - pdf_count - office_count - image_count
 
                 if is_debug_enabled():
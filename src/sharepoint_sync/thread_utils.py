@@ -10,61 +10,81 @@ import threading
 import builtins
 from queue import Queue, Empty
 
+from .utils import is_debug_enabled
+
 # Global locks for thread-safe operations
 _console_lock = threading.Lock()
 _original_print = builtins.print
 
+# Per-thread cache of the computed "[Upload-1]"-style prefix, so the name
+# parsing below runs once per thread instead of once per print call
+_thread_prefix_cache = threading.local()
 
-def thread_safe_print(*args, **kwargs):
+
+def _get_thread_prefix():
     """
-    Thread-safe replacement for print() that ensures sequential output.
-    When DEBUG=true, includes thread identifier to track which thread produced each log line.
+    Return this thread's log prefix, computing and caching it on first use.
 
-    Thread identifiers (DEBUG mode only):
+    Thread identifiers:
         [Main] - Main thread (orchestration, statistics, summaries)
         [Upload-N] - Upload worker threads
         [Convert-N] - Markdown conversion worker threads
 
+    Returns:
+        str: Prefix like "[Main]" or "[Upload-2]"
+    """
+    prefix = getattr(_thread_prefix_cache, 'prefix', None)
+    if prefix is not None:
+        return prefix
+
+    thread_name = threading.current_thread().name
+
+    if thread_name == "MainThread":
+        prefix = "[Main]"
+    elif thread_name.startswith("Upload-"):
+        # Upload worker: "Upload-1" -> "[Upload-1]"
+        prefix = f"[{thread_name}]"
+    elif thread_name.startswith("Convert-"):
+        # Conversion worker: "Convert-1" -> "[Convert-1]"
+        prefix = f"[{thread_name}]"
+    elif "ThreadPoolExecutor" in thread_name:
+        # Unnamed worker thread - extract number
+        parts = thread_name.split('_')
+        if len(parts) > 1:
+            worker_num = parts[-1]
+        else:
+            parts = thread_name.split('-')
+            worker_num = parts[-1] if parts[-1].isdigit() else "?"
+        prefix = f"[Worker-{worker_num}]"
+    else:
+        # Unknown thread type - use name as-is (truncated)
+        prefix = f"[{thread_name[:10]}]"
+
+    _thread_prefix_cache.prefix = prefix
+    return prefix
+
+
+def thread_safe_print(*args, **kwargs):
+    """
+    Thread-safe replacement for print() that ensures sequential output.
+    When DEBUG=true, includes thread identifier to track which thread produced each log line.
+
+    The debug flag comes from the memoized is_debug_enabled() and the thread
+    prefix is cached per thread, so the stdout lock is held only for the
+    write itself - this function sits on the parallel workers' hot path.
+
     Args:
         *args: Same as print()
         **kwargs: Same as print()
     """
-    import os
-
-    # Check if debug mode is enabled
-    show_thread_id = os.environ.get('DEBUG', '').lower() == 'true'
-
-    with _console_lock:
-        if show_thread_id and args:
-            # Get thread information
-            thread_name = threading.current_thread().name
-
-            # Determine thread prefix based on thread name
-            if thread_name == "MainThread":
-                prefix = "[Main]"
-            elif thread_name.startswith("Upload-"):
-                # Upload worker: "Upload-1" -> "[Upload-1]"
-                prefix = f"[{thread_name}]"
-            elif thread_name.startswith("Convert-"):
-                # Conversion worker: "Convert-1" -> "[Convert-1]"
-                prefix = f"[{thread_name}]"
-            elif "ThreadPoolExecutor" in thread_name:
-                # Unnamed worker thread - extract number
-                parts = thread_name.split('_')
-                if len(parts) > 1:
-                    worker_num = parts[-1]
-                else:
-                    parts = thread_name.split('-')
-                    worker_num = parts[-1] if parts[-1].isdigit() else "?"
-                prefix = f"[Worker-{worker_num}]"
-            else:
-                # Unknown thread type - use name as-is (truncated)
-                prefix = f"[{thread_name[:10]}]"
-
+    if is_debug_enabled() and args:
+        prefix = _get_thread_prefix()
+        with _console_lock:
             # Prepend thread identifier to output
             _original_print(prefix, *args, **kwargs)
-        else:
-            # Normal mode (DEBUG=false) or empty print call
+    else:
+        # Normal mode (DEBUG=false) or empty print call
+        with _console_lock:
             _original_print(*args, **kwargs)
 
 
@@ -10,6 +10,8 @@ All operations use direct Graph REST API calls.
 
 import os
 import time
+import threading
+from collections import OrderedDict
 from .file_handler import (
     sanitize_sharepoint_name,
     sanitize_path_components,
@@ -19,17 +21,239 @@ from .file_handler import (
 from .graph_api import (
     update_sharepoint_list_item_field,
     create_folder_graph,
+    create_folder_path_graph,
     list_folder_children_graph,
+    batch_probe_folder_paths,
+    batch_create_folder_paths,
     upload_small_file_graph,
     create_upload_session_graph,
     upload_file_chunk_graph
 )
 from .utils import is_debug_enabled
 
+class _FolderPathCache:
+    """
+    Bounded, case-insensitive LRU cache for resolved folder paths.
+
+    Keys are normalized (slashes stripped, lowercased) so "a/b/", "/a/b"
+    and "A/B" collapse to one entry - SharePoint paths are
+    case-insensitive, so these all name the same folder. Entries are
+    small {'id', 'name'} dicts and the cache is capped (FOLDER_CACHE_SIZE
+    env var, default 50,000) with least-recently-used eviction, so a
+    migration run over hundreds of thousands of folders can't grow the
+    cache without bound. Supports the same `path in cache`, `cache[path]`
+    and `cache[path] = item` operations the previous plain dict did, with
+    a lock so parallel upload workers can share it safely.
+    """
+
+    def __init__(self, maxsize=None):
+        if maxsize is None:
+            try:
+                maxsize = int(os.environ.get('FOLDER_CACHE_SIZE', '50000'))
+            except ValueError:
+                maxsize = 50000
+        self.maxsize = max(1, maxsize)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(path):
+        return path.replace('\\', '/').strip('/').lower()
+
+    def __contains__(self, path):
+        key = self._key(path)
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return True
+            return False
+
+    def __getitem__(self, path):
+        key = self._key(path)
+        with self._lock:
+            value = self._data[key]
+            self._data.move_to_end(key)
+            return value
+
+    def __setitem__(self, path, value):
+        key = self._key(path)
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
 # Global cache for created folders
-# Using a dictionary (path -> folder_item_dict) to avoid redundant API calls
-# Structure: {path: {'id': item_id, 'name': folder_name, ...}}
-created_folders = {}
+# Bounded LRU (path -> folder_item_dict) to avoid redundant API calls
+# Structure: {normalized_path: {'id': item_id, 'name': folder_name}}
+created_folders = _FolderPathCache()
+
+# Global cache for folder children listings
+# Structure: {parent_item_id: {child_name: child_item_dict}}
+# Listing a folder once and answering sibling lookups from the dict turns the
+# per-segment existence checks from one API round-trip each into O(1) lookups.
+# Missing names double as cached negative lookups, so repeated probes for a
+# folder that doesn't exist don't re-list the parent either.
+folder_children_cache = {}
+
+# Folder paths a batch probe confirmed missing (404) in SharePoint
+# ensure_folder_exists() skips the per-folder listing round-trip for these
+# and goes straight to creation; paths are discarded once created.
+probed_missing_folders = set()
+
+
+def prefetch_folder_probes(site_id, drive_id, root_item_id, dir_paths,
+                           tenant_id, client_id, client_secret,
+                           login_endpoint, graph_endpoint, folder_cache=None):
+    """
+    Probe the upload run's folder paths in bulk before per-file processing.
+
+    Expands each directory path into all of its ancestor prefixes, drops
+    paths already known from earlier runs or the metadata cache, and checks
+    the remainder with batch_probe_folder_paths() (20 probes per request).
+    Found folders are seeded into created_folders; confirmed-missing paths
+    are then bulk-created with batch_create_folder_paths() (20 creates per
+    request, parent-before-child). Any path the bulk create couldn't handle
+    stays in probed_missing_folders so ensure_folder_exists() can create it
+    without first listing the parent.
+
+    Args:
+        site_id (str): SharePoint site ID
+        drive_id (str): SharePoint drive ID
+        root_item_id (str): Upload root folder item ID
+        dir_paths (iterable): Sanitized directory paths relative to the root
+        tenant_id (str): Azure AD tenant ID
+        client_id (str): Azure AD application client ID
+        client_secret (str): Azure AD application client secret
+        login_endpoint (str): Azure AD login endpoint
+        graph_endpoint (str): Microsoft Graph API endpoint
+        folder_cache (dict): Optional folder cache from build_sharepoint_cache();
+            paths already present there are not probed
+
+    Note:
+        If the $batch endpoint is unavailable this is a silent no-op and
+        ensure_folder_exists() keeps its per-folder probing behavior.
+    """
+    # Collect every unique ancestor prefix (a/b/c -> a, a/b, a/b/c)
+    unique_paths = set()
+    for dir_path in dir_paths:
+        parts = [part for part in dir_path.replace('\\', '/').split('/') if part]
+        current_path = ""
+        for part in parts:
+            current_path = f"{current_path}/{part}" if current_path else part
+            if current_path in created_folders:
+                continue
+            if folder_cache and current_path in folder_cache:
+                continue
+            unique_paths.add(current_path)
+
+    if not unique_paths:
+        return
+
+    # Probe shallow paths first so parents resolve before their children
+    probe_list = sorted(unique_paths, key=lambda p: (p.count('/'), p))
+
+    results = batch_probe_folder_paths(
+        site_id, drive_id, root_item_id, probe_list,
+        tenant_id, client_id, client_secret, login_endpoint, graph_endpoint
+    )
+
+    if results is None:
+        return  # $batch unavailable - per-folder probing still works
+
+    found_count = 0
+    missing_paths = []
+    for path, item in results.items():
+        if item is None:
+            probed_missing_folders.add(path)
+            missing_paths.append(path)
+        elif 'folder' in item:
+            created_folders[path] = {
+                'id': item.get('id'),
+                'name': item.get('name')
+            }
+            found_count += 1
+
+    if is_debug_enabled():
+        print(f"[DEBUG] Batch probe: {found_count} existing folder(s), "
+              f"{len(probed_missing_folders)} missing, of {len(probe_list)} probed")
+
+    if not missing_paths:
+        return
+
+    # Create the confirmed-missing folders in bulk as well: 20 creates per
+    # $batch request (dependsOn preserves parent-before-child order) instead
+    # of one POST per folder inside ensure_folder_exists. Paths the batch
+    # couldn't create stay in probed_missing_folders and are created
+    # individually as before.
+    missing_paths.sort(key=lambda p: (p.count('/'), p))
+    created = batch_create_folder_paths(
+        site_id, drive_id, root_item_id, missing_paths,
+        tenant_id, client_id, client_secret, login_endpoint, graph_endpoint
+    )
+
+    if not created:
+        return
+
+    for path, item in created.items():
+        created_folders[path] = {
+            'id': item.get('id'),
+            'name': item.get('name')
+        }
+        probed_missing_folders.discard(path)
+
+    if is_debug_enabled():
+        print(f"[DEBUG] Batch created {len(created)} of {len(missing_paths)} missing folder(s)")
+
+
+def _get_children_map(site_id, drive_id, parent_item_id,
+                      tenant_id, client_id, client_secret, login_endpoint, graph_endpoint,
+                      folder_path=None, refresh=False):
+    """
+    Return a {name: item} dict of a folder's children, cached per parent item ID.
+
+    Args:
+        site_id (str): SharePoint site ID
+        drive_id (str): SharePoint drive ID
+        parent_item_id (str): Item ID of the folder to list
+        tenant_id (str): Azure AD tenant ID
+        client_id (str): Azure AD application client ID
+        client_secret (str): Azure AD application client secret
+        login_endpoint (str): Azure AD login endpoint
+        graph_endpoint (str): Microsoft Graph API endpoint
+        folder_path (str): Display path for debug messages (optional)
+        refresh (bool): Force a fresh listing, bypassing the cache (used after
+            a nameAlreadyExists race where another worker created the folder)
+
+    Returns:
+        dict: Mapping of child name to child item dict (empty if listing failed)
+
+    Note:
+        Failed listings are not cached, so a transient API error doesn't
+        poison later lookups with a spuriously empty children map.
+    """
+    if not refresh:
+        cached = folder_children_cache.get(parent_item_id)
+        if cached is not None:
+            return cached
+
+    children = list_folder_children_graph(
+        site_id, drive_id, parent_item_id,
+        tenant_id, client_id, client_secret, login_endpoint, graph_endpoint,
+        folder_path=folder_path
+    )
+
+    if children is None:
+        return {}
+
+    children_map = {child.get('name'): child for child in children}
+    folder_children_cache[parent_item_id] = children_map
+    return children_map
 
 
 def ensure_folder_exists(site_id, drive_id, parent_item_id, folder_path,
@@ -88,15 +312,45 @@ def ensure_folder_exists(site_id, drive_id, parent_item_id, folder_path,
     if not path_parts:
         return parent_item_id
 
+    # Build every cumulative prefix once (a/b/c -> a, a/b, a/b/c) instead
+    # of re-concatenating the path string at each depth of each loop below
+    prefixes = []
+    acc = []
+    for part in path_parts:
+        acc.append(part)
+        prefixes.append('/'.join(acc))
+
+    # Opportunistic single-shot create: when nothing along the path is known
+    # yet, ask Graph to create the leaf by path in one request instead of
+    # walking the tree with one round-trip per segment. Returns None whenever
+    # the service can't honor it (leaf exists, intermediates missing), in
+    # which case the per-segment walk below proceeds as before.
+    if len(path_parts) > 1:
+        prefix_known = False
+        for prefix in prefixes[:-1]:
+            if prefix in created_folders or (folder_cache and prefix in folder_cache):
+                prefix_known = True
+                break
+        if not prefix_known:
+            deep_folder = create_folder_path_graph(
+                site_id, drive_id, parent_item_id, folder_path,
+                tenant_id, client_id, client_secret, login_endpoint, graph_endpoint
+            )
+            if deep_folder and deep_folder.get('id'):
+                created_folders[folder_path] = {
+                    'id': deep_folder.get('id'),
+                    'name': deep_folder.get('name')
+                }
+                probed_missing_folders.discard(folder_path)
+                if is_debug_enabled():
+                    print(f"[✓] Created folder path in one call: {folder_path}")
+                return deep_folder['id']
+
     # Start from the parent folder
     current_item_id = parent_item_id
-    current_path = ""  # Track the path we've built so far
-
-    # Process each folder in the path
-    for folder_name in path_parts:
-        # Build cumulative path as we go deeper
-        current_path = f"{current_path}/{folder_name}" if current_path else folder_name
 
+    # Process each folder in the path with its precomputed cumulative path
+    for folder_name, current_path in zip(path_parts, prefixes):
         # Skip if we've already processed this folder path
         if current_path in created_folders:
             current_item_id = created_folders[current_path]['id']
@@ -119,35 +373,37 @@ def ensure_folder_exists(site_id, drive_id, parent_item_id, folder_path,
                 print(f"[CACHE HIT] Folder found in cache: {current_path}")
             folder_found = True
 
+        # Skip the API probe when a batch probe already confirmed this
+        # path is missing - go straight to creation below
+        if not folder_found and current_path in probed_missing_folders:
+            pass
+
         # Fall back to API query if not in cache
-        if not folder_found:
+        elif not folder_found:
             try:
                 if is_debug_enabled():
                     print(f"[?] Checking if folder exists: {current_path}")
 
-                # Get all items in current folder using Graph API
-                children = list_folder_children_graph(
+                # Look up the folder in the cached children map (one listing
+                # per parent; sibling checks are answered without API calls)
+                children_map = _get_children_map(
                     site_id, drive_id, current_item_id,
                     tenant_id, client_id, client_secret, login_endpoint, graph_endpoint,
                     folder_path=current_path
                 )
 
-                if children is not None:
-                    # Iterate through children to find matching folder
-                    for child in children:
-                        # Check if this is a folder with matching name
-                        if child.get('name') == folder_name and 'folder' in child:
-                            # Folder found! Cache it
-                            folder_item = {
-                                'id': child.get('id'),
-                                'name': child.get('name')
-                            }
-                            created_folders[current_path] = folder_item
-                            current_item_id = folder_item['id']
-                            if is_debug_enabled():
-                                print(f"[✓] Folder already exists: {current_path}")
-                            folder_found = True
-                            break
+                child = children_map.get(folder_name)
+                if child is not None and 'folder' in child:
+                    # Folder found! Cache it
+                    folder_item = {
+                        'id': child.get('id'),
+                        'name': child.get('name')
+                    }
+                    created_folders[current_path] = folder_item
+                    current_item_id = folder_item['id']
+                    if is_debug_enabled():
+                        print(f"[✓] Folder already exists: {current_path}")
+                    folder_found = True
 
             except Exception as e:
                 # API call failed - assume folder doesn't exist
@@ -174,6 +430,12 @@ def ensure_folder_exists(site_id, drive_id, parent_item_id, folder_path,
                         'name': created_folder.get('name')
                     }
                     created_folders[current_path] = folder_item
+                    probed_missing_folders.discard(current_path)
+                    # Insert into the parent's cached children map so sibling
+                    # creations under the same parent don't re-list it
+                    parent_children = folder_children_cache.get(current_item_id)
+                    if parent_children is not None:
+                        parent_children[created_folder.get('name')] = created_folder
                     current_item_id = folder_item['id']
                     if is_debug_enabled():
                         print(f"[✓] Created folder: {current_path}")
@@ -188,24 +450,23 @@ def ensure_folder_exists(site_id, drive_id, parent_item_id, folder_path,
                     if is_debug_enabled():
                         print(f"[!] Folder already exists (race condition): {folder_name}")
                     try:
-                        # Try to get the existing folder
-                        children = list_folder_children_graph(
+                        # Another worker created it after our listing - force a
+                        # fresh listing so the cache picks up the new folder
+                        children_map = _get_children_map(
                             site_id, drive_id, current_item_id,
                             tenant_id, client_id, client_secret, login_endpoint, graph_endpoint,
-                            folder_path=current_path
+                            folder_path=current_path, refresh=True
                         )
-                        if children:
-                            for child in children:
-                                if child.get('name') == folder_name and 'folder' in child:
-                                    folder_item = {
-                                        'id': child.get('id'),
-                                        'name': child.get('name')
-                                    }
-                                    created_folders[current_path] = folder_item
-                                    current_item_id = folder_item['id']
-                                    if is_debug_enabled():
-                                        print(f"[✓] Found existing folder: {current_path}")
-                                    break
+                        child = children_map.get(folder_name)
+                        if child is not None and 'folder' in child:
+                            folder_item = {
+                                'id': child.get('id'),
+                                'name': child.get('name')
+                            }
+                            created_folders[current_path] = folder_item
+                            current_item_id = folder_item['id']
+                            if is_debug_enabled():
+                                print(f"[✓] Found existing folder: {current_path}")
                     except Exception as fallback_error:
                         print(f"[!] Could not retrieve existing folder: {fallback_error}")
                 else:
@@ -221,6 +482,40 @@ def progress_status(offset, file_size):
         print(f"Uploaded {offset} bytes from {file_size} bytes ... {offset/file_size*100:.2f}%")
 
 
+def make_progress_reporter(file_size, min_interval=1.0, min_bytes=10 * 1024 * 1024):
+    """
+    Build a throttled per-upload progress reporter.
+
+    A gigabyte-scale upload calls the progress callback on every chunk;
+    printing each one means hundreds of formatted lines per file. The
+    returned closure emits at most once per `min_interval` seconds or per
+    `min_bytes` uploaded (whichever comes first), and always reports the
+    final offset so completed uploads show 100%.
+
+    Args:
+        file_size (int): Total upload size in bytes
+        min_interval (float): Minimum seconds between progress lines
+        min_bytes (int): Minimum bytes uploaded between progress lines
+
+    Returns:
+        callable: report(offset) - prints progress when due (DEBUG only)
+    """
+    state = {'last_time': 0.0, 'last_bytes': 0}
+
+    def report(offset):
+        if not is_debug_enabled():
+            return
+        now = time.monotonic()
+        if (offset >= file_size
+                or now - state['last_time'] >= min_interval
+                or offset - state['last_bytes'] >= min_bytes):
+            state['last_time'] = now
+            state['last_bytes'] = offset
+            print(f"Uploaded {offset} bytes from {file_size} bytes ... {offset/file_size*100:.2f}%")
+
+    return report
+
+
 def success_callback(remote_file, local_path, display_name=None, is_update=False):
     """
     Display success message after file upload.
@@ -309,33 +604,123 @@ def resumable_upload(site_id, drive_id, parent_item_id, local_path, filename, fi
         if is_debug_enabled():
             print(f"[DEBUG] Upload session created. Chunk size: {chunk_size:,} bytes")
 
-        with open(local_path, 'rb') as f:
-            offset = 0
-            while offset < file_size:
-                # Read next chunk
-                f.seek(offset)
-                chunk_data = f.read(chunk_size)
-                chunk_end = offset + len(chunk_data) - 1
-
-                # Upload chunk
-                result = upload_file_chunk_graph(
-                    upload_url, chunk_data, offset, chunk_end, file_size
-                )
+        # Precompute every chunk's Content-Range/Content-Length headers up
+        # front - file_size and chunk_size are fixed once the session is
+        # created, so the per-chunk f-string and dict construction moves out
+        # of the upload loop into one list comprehension.
+        range_headers = [
+            {
+                'Content-Length': str(min(chunk_size, file_size - o)),
+                'Content-Range': f"bytes {o}-{min(o + chunk_size, file_size) - 1}/{file_size}"
+            }
+            for o in range(0, file_size, chunk_size)
+        ]
+
+        # Graph upload sessions require chunks in file order (the service
+        # tracks nextExpectedRanges), so chunks can't be PUT concurrently.
+        # Instead, pipeline disk and network: a single reader thread
+        # prefetches the next chunk while the current one is in flight, so
+        # disk read latency overlaps the PUT round-trip.
+        from concurrent.futures import ThreadPoolExecutor
+
+        with open(local_path, 'rb') as f, \
+             ThreadPoolExecutor(max_workers=1, thread_name_prefix='ChunkRead') as reader:
+
+            # Tell the kernel this file is read once, front to back: larger
+            # readahead and no lingering page-cache pressure from multi-GB
+            # files (matters when parallel workers stream several at once).
+            # posix_fadvise is Linux/POSIX only, so guard for other platforms.
+            # Advise separately: some kernels reject NOREUSE with EINVAL,
+            # and a combined call would lose the SEQUENTIAL hint too.
+            if hasattr(os, 'posix_fadvise'):
+                for advice_name in ('POSIX_FADV_SEQUENTIAL', 'POSIX_FADV_NOREUSE'):
+                    advice = getattr(os, advice_name, None)
+                    if advice is None:
+                        continue
+                    try:
+                        os.posix_fadvise(f.fileno(), 0, 0, advice)
+                    except OSError:
+                        pass  # Advisory only - never fail the upload over it
+
+            # Map the file and send memoryview slices directly: the PUT then
+            # reads straight from the page cache instead of copying every
+            # chunk into a fresh bytes object first (for a 100 GB file that
+            # is ~100 GB of skipped memcpy). Falls back to pread if mmap is
+            # unavailable for this file (e.g. special filesystems).
+            import mmap
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                mm_view = memoryview(mm)
+            except (ValueError, OSError):
+                mm = None
+                mm_view = None
+
+            def read_chunk(read_offset):
+                chunk_limit = min(read_offset + chunk_size, file_size)
+                if mm_view is not None:
+                    # Zero-copy slice; madvise asks the kernel to start
+                    # faulting the pages in now, which is what makes this
+                    # "read-ahead" rather than just deferred page faults
+                    if hasattr(mm, 'madvise'):
+                        try:
+                            mm.madvise(mmap.MADV_WILLNEED, read_offset,
+                                       chunk_limit - read_offset)
+                        except (OSError, ValueError):
+                            pass
+                    return mm_view[read_offset:chunk_limit]
+                # os.pread avoids mutating shared file position; fall back to
+                # seek+read on platforms without it (single reader thread, so
+                # the file position is only touched here)
+                if hasattr(os, 'pread'):
+                    return os.pread(f.fileno(), chunk_size, read_offset)
+                f.seek(read_offset)
+                return f.read(chunk_size)
 
-                if result is None:
-                    raise Exception(f"Failed to upload chunk at offset {offset}")
+            try:
+                offset = 0
+                next_chunk = reader.submit(read_chunk, offset)
+                report_progress = make_progress_reporter(file_size)
+
+                while offset < file_size:
+                    chunk_data = next_chunk.result()
+                    chunk_end = offset + len(chunk_data) - 1
+
+                    # Prefetch the following chunk while this one uploads
+                    next_offset = offset + len(chunk_data)
+                    if next_offset < file_size:
+                        next_chunk = reader.submit(read_chunk, next_offset)
+
+                    # Upload chunk
+                    result = upload_file_chunk_graph(
+                        upload_url, chunk_data, offset, chunk_end, file_size,
+                        headers=range_headers[offset // chunk_size]
+                    )
 
-                # Update progress
-                progress_status(offset + len(chunk_data), file_size)
+                    if result is None:
+                        raise Exception(f"Failed to upload chunk at offset {offset}")
 
-                offset += len(chunk_data)
+                    # Update progress (throttled - see make_progress_reporter)
+                    report_progress(next_offset)
 
-                # Check if upload is complete
-                if 'id' in result:
-                    # Upload complete! File metadata returned
-                    if is_debug_enabled():
-                        print(f"[✓] Large file upload complete: {sanitized_name}")
-                    return result
+                    offset = next_offset
+
+                    # Check if upload is complete
+                    if 'id' in result:
+                        # Upload complete! File metadata returned
+                        if is_debug_enabled():
+                            print(f"[✓] Large file upload complete: {sanitized_name}")
+                        return result
+            finally:
+                # Drop every view into the map before closing it; a live
+                # exported slice would make mmap.close() raise BufferError
+                if mm is not None:
+                    chunk_data = None
+                    next_chunk = None
+                    mm_view.release()
+                    try:
+                        mm.close()
+                    except BufferError:
+                        pass
 
         # If we get here, all chunks uploaded successfully
         if is_debug_enabled():
@@ -348,74 +733,97 @@ def resumable_upload(site_id, drive_id, parent_item_id, local_path, filename, fi
         raise
 
 
-def check_and_delete_existing_file(drive, file_name):
+def check_and_delete_existing_file(site_id, drive_id, parent_item_id, file_name,
+                                   tenant_id, client_id, client_secret, login_endpoint, graph_endpoint):
     """
     Check if a file exists in SharePoint and delete it to enable replacement.
 
     This function implements the "delete-then-upload" strategy to ensure
-    existing files are properly replaced with newer versions.
+    existing files are properly replaced with newer versions. The lookup is
+    a single path-addressed GET selecting just id/file/folder, and a 404 is
+    distinguished from other failures by status code - a network hiccup or
+    permission error raises instead of being silently treated as "file does
+    not exist".
 
     Args:
-        drive (DriveItem): The folder to check for existing file
+        site_id (str): SharePoint site ID
+        drive_id (str): SharePoint drive ID
+        parent_item_id (str): Item ID of the folder to check in
         file_name (str): Name of the file to check (e.g., 'report.pdf')
+        tenant_id (str): Azure AD tenant ID
+        client_id (str): Azure AD application client ID
+        client_secret (str): Azure AD application client secret
+        login_endpoint (str): Azure AD login endpoint
+        graph_endpoint (str): Microsoft Graph API endpoint
 
     Returns:
         bool: True if an existing file was deleted, False if no file existed
+            (or a folder of the same name does)
 
-    Example:
-        was_deleted = check_and_delete_existing_file(folder, "data.xlsx")
-        if was_deleted:
-            print("Replacing existing file")
-        else:
-            print("Uploading new file")
+    Raises:
+        Exception: On non-404 lookup failures or a failed delete, so callers
+            can't mistake a transient error for a missing file
 
     Note:
-        This function is necessary because the Office365 library's upload_file()
-        method doesn't overwrite existing files by default (known limitation).
-        File names are sanitized for SharePoint compatibility before checking.
+        The primary Graph upload path overwrites in place (no delete needed);
+        this helper only serves the explicit delete-then-upload flow.
     """
+    from .graph_api import make_graph_request_with_retry
+    from .auth import acquire_token
+
     # Sanitize the file name to match what would be stored in SharePoint
     sanitized_name = sanitize_sharepoint_name(file_name, is_folder=False)
 
-    try:
-        # Attempt to retrieve file by sanitized name from SharePoint
-        # get_by_path() navigates to the file, get() retrieves metadata
-        # execute_query() sends the API request
-        existing_file = drive.get_by_path(sanitized_name).get().execute_query()
-
-        # Verify it's a file, not a folder with the same name
-        # Files don't have a 'folder' attribute, folders do
-        if not hasattr(existing_file, 'folder'):
-            if is_debug_enabled():
-                print(f"[!] Existing file found: {sanitized_name}")
-            if sanitized_name != file_name:
-                if is_debug_enabled():
-                    print(f"    (Original name: {file_name})")
-            if is_debug_enabled():
-                print(f"[×] Deleting existing file to prepare for replacement...")
+    import urllib.parse
+    token = acquire_token(tenant_id, client_id, client_secret, login_endpoint, graph_endpoint)
+    if not token:
+        raise Exception("Failed to acquire authentication token")
 
-            # Delete the file from SharePoint
-            # delete_object() marks for deletion, execute_query() performs it
-            existing_file.delete_object().execute_query()
-            if is_debug_enabled():
-                print(f"[✓] Existing file deleted successfully")
+    headers = {
+        'Authorization': f"Bearer {token['access_token']}",
+        'Accept': 'application/json'
+    }
 
-            # Brief pause to ensure SharePoint processes the deletion
-            # Some SharePoint instances need this to avoid conflicts
-            time.sleep(0.5)
-            return True  # Signal that file was replaced
-        else:
-            # Edge case: A folder exists with the same name as our file
-            if is_debug_enabled():
-                print(f"[!] Found folder with same name as file: {file_name}")
-            return False
+    encoded_name = urllib.parse.quote(sanitized_name)
+    item_url = (f"https://{graph_endpoint}/v1.0/sites/{site_id}/drives/{drive_id}"
+                f"/items/{parent_item_id}:/{encoded_name}?$select=id,name,file,folder")
+
+    response = make_graph_request_with_retry(item_url, headers, method='GET')
 
-    except Exception:  # noqa: S110 - Broad exception acceptable here
-        # Exception usually means file doesn't exist (404 error)
-        # This is expected for new files, so we return False
-        # Other errors (network, permissions) will be caught later during upload
+    if response.status_code == 404:
+        # Genuinely absent - the expected case for new files
+        return False
+    if response.status_code != 200:
+        raise Exception(f"Existence check failed: {response.status_code} - {response.text[:200]}")
+
+    item = response.json()
+
+    if 'folder' in item:
+        # Edge case: a folder exists with the same name as our file
+        if is_debug_enabled():
+            print(f"[!] Found folder with same name as file: {file_name}")
         return False
 
+    if is_debug_enabled():
+        print(f"[!] Existing file found: {sanitized_name}")
+        if sanitized_name != file_name:
+            print(f"    (Original name: {file_name})")
+        print(f"[×] Deleting existing file to prepare for replacement...")
+
+    delete_url = f"https://{graph_endpoint}/v1.0/sites/{site_id}/drives/{drive_id}/items/{item['id']}"
+    delete_response = make_graph_request_with_retry(delete_url, headers, method='DELETE')
+
+    if delete_response.status_code not in (200, 204):
+        raise Exception(f"Delete failed: {delete_response.status_code} - {delete_response.text[:200]}")
+
+    if is_debug_enabled():
+        print(f"[✓] Existing file deleted successfully")
+
+    # No fixed pause here: the subsequent upload's retry handling already
+    # backs off on a 409 in the rare case SharePoint hasn't finished
+    # processing the delete
+    return True  # Signal that file was replaced
+
 
 def upload_file(site_id, drive_id, parent_item_id, local_path, chunk_size, force_upload, site_url, list_name,
                 filehash_column_available, tenant_id, client_id, client_secret,
@@ -467,7 +875,8 @@ def upload_file(site_id, drive_id, parent_item_id, local_path, chunk_size, force
             local_path, file_name, site_url, list_name,
             filehash_column_available, tenant_id, client_id, client_secret,
             login_endpoint, graph_endpoint, upload_stats_dict, pre_calculated_hash, display_path,
-            site_id, drive_id, parent_item_id, sharepoint_cache
+            site_id, drive_id, parent_item_id, sharepoint_cache,
+            local_size=file_size  # Already stat'ed above - skip the second getsize
         )
 
         # If file doesn't need updating, skip it
@@ -502,18 +911,15 @@ def upload_file(site_id, drive_id, parent_item_id, local_path, chunk_size, force
             if local_hash and is_debug_enabled():
                 print(f"[#] Calculated hash for force upload: {local_hash[:8]}...")
 
-        # Check if file exists by listing children
+        # Check if file exists via the cached children map (O(1) lookup, and
+        # files forced into the same folder share one listing)
         try:
-            children = list_folder_children_graph(
+            children_map = _get_children_map(
                 site_id, drive_id, parent_item_id,
                 tenant_id, client_id, client_secret, login_endpoint, graph_endpoint
             )
-            file_exists = False
-            if children:
-                for child in children:
-                    if child.get('name') == sanitized_name and 'file' in child:
-                        file_exists = True
-                        break
+            child = children_map.get(sanitized_name)
+            file_exists = child is not None and 'file' in child
 
             if file_exists:
                 is_file_update = True
@@ -575,6 +981,18 @@ def upload_file(site_id, drive_id, parent_item_id, local_path, chunk_size, force
                 is_update=is_file_update
             )
 
+        # Keep the per-folder indexes truthful: later lookups in this run
+        # (force-upload existence checks, sibling comparisons) should see the
+        # file we just wrote instead of the pre-upload listing
+        if uploaded_item and uploaded_item.get('name'):
+            cached_children = folder_children_cache.get(parent_item_id)
+            if cached_children is not None:
+                cached_children[uploaded_item['name']] = uploaded_item
+            from .graph_api import folder_index_cache
+            cached_index = folder_index_cache.get(parent_item_id)
+            if cached_index is not None:
+                cached_index[uploaded_item['name']] = uploaded_item
+
         # Update upload byte counter after successful upload
         upload_stats_dict['bytes_uploaded'] += file_size
 
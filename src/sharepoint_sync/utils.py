@@ -7,6 +7,14 @@ This module provides common helper functions used across multiple modules.
 
 import os
 
+# Resolved debug flags, parsed once on first use. The env vars never change
+# mid-run, and the per-file hot paths consult these helpers constantly, so
+# re-reading os.environ and lowercasing the value every call is pure waste.
+# Resolution is deferred to the first call (not import time) so load_dotenv()
+# in the consuming modules has populated os.environ by then.
+_debug_metadata_enabled = None
+_debug_enabled = None
+
 
 def get_library_name_from_path(upload_path):
     """
@@ -36,7 +44,10 @@ def is_debug_metadata_enabled():
     Returns:
         bool: True if debug metadata mode is enabled, False otherwise
     """
-    return os.environ.get('DEBUG_METADATA', 'false').lower() == 'true'
+    global _debug_metadata_enabled
+    if _debug_metadata_enabled is None:
+        _debug_metadata_enabled = os.environ.get('DEBUG_METADATA', 'false').lower() == 'true'
+    return _debug_metadata_enabled
 
 
 def is_debug_enabled():
@@ -55,4 +66,7 @@ def is_debug_enabled():
     Returns:
         bool: True if general debug mode is enabled, False otherwise
     """
-    return os.environ.get('DEBUG', 'false').lower() == 'true'
+    global _debug_enabled
+    if _debug_enabled is None:
+        _debug_enabled = os.environ.get('DEBUG', 'false').lower() == 'true'
+    return _debug_enabled